@@ -21,26 +21,78 @@ __author__ = "RA7 Team"
 __version__ = "1.0.0"
 __license__ = "MIT"
 
-import json
+import asyncio
+import atexit
+import functools
+import inspect
 import logging
 import os
+import re
+import sqlite3
+import struct
+import sys
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
 
 try:
     import requests
-except ImportError:
-    print("The 'requests' library is not installed. Please install it with 'pip install requests'")
-    exit(1)
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:  # pragma: no cover - optional dependency; the httpx async paths work without it
+    requests = None
+
+import memory_db
+import ra7_io
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
 
 # --- Configuration ---
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 MODEL = "deepseek/deepseek-r1"
-MEMORY_FILE = "memory.json"
+MEMORY_FILE = "memory.db"
+# Earlier history formats (JSON array, then JSON Lines), imported into MEMORY_FILE on first use
+LEGACY_MEMORY_FILES = ("memory.json", "memory.jsonl")
+GPS_URL = "https://ipapi.co/json"
+NTP_URL = "https://worldtimeapi.org/api/ip"
 GPS_PRECISION = 4  # Corresponds to approximately 15 km
 NTP_TOLERANCE = 60  # in seconds
 REQUEST_TIMEOUT = 30 # in seconds
+# in seconds; the device location rarely changes
+GPS_CACHE_TTL = float(os.environ.get("RA7_GPS_CACHE_TTL", 300))
+# in seconds; keep well inside NTP_TOLERANCE
+NTP_CACHE_TTL = float(os.environ.get("RA7_NTP_CACHE_TTL", 30))
+LLM_BATCH_SIZE = 32  # Larger batches degrade per-action rating quality
+LLM_CONCURRENCY = 16  # Maximum in-flight LLM requests in evolve_batch_async()
+
+# --- Semantic Score Cache (opt-in, needs faiss + sentence-transformers) ---
+SEMANTIC_CACHE = os.environ.get("RA7_SEMANTIC_CACHE") == "1"
+SEMANTIC_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_THRESHOLD = 0.92  # Minimum cosine similarity for a cache hit
+SEMANTIC_INDEX_FILE = "memory.faiss"
+SEMANTIC_FLUSH_EVERY = 32  # New cache entries buffered before the index is rewritten
+# Scores file of the earlier two-file cache format, removed on the first flush
+LEGACY_SEMANTIC_SCORES_FILE = "memory_scores.json"
+
+# --- HTTP Session ---
+# A single pooled session keeps TCP/TLS connections alive across evolve() calls.
+HTTP_HEADERS = {"User-Agent": f"RA7-Kernel/{__version__}", "Accept-Encoding": "gzip"}
+_SESSION = None
+if requests is not None:
+    _SESSION = requests.Session()
+    _SESSION.headers.update(HTTP_HEADERS)
+    _SESSION.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        ),
+    )
 
 # --- SATI Codex ---
 SATI_CODEX = [
@@ -50,6 +102,19 @@ SATI_CODEX = [
     "Impact: maximize positive outcome"
 ]
 
+# The codex lives in the system message, formatted once, so every request
+# starts with a byte-identical prefix that the provider's prompt cache can
+# reuse; only the short user message varies.
+_CODEX_STR = "\n".join(f"- {principle}" for principle in SATI_CODEX)
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": f"You are an ethical AI evaluator.\nCodex:\n{_CODEX_STR}\nReply only a single float 0-1 for alignment.",
+}
+_BATCH_SYSTEM_MSG = {
+    "role": "system",
+    "content": f"You are an ethical AI evaluator.\nCodex:\n{_CODEX_STR}\nReply only one float 0-1 per line, in order.",
+}
+
 # --- Logging Setup ---
 logging.basicConfig(
     level=logging.INFO,
@@ -59,29 +124,190 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def ttl_cache(seconds: float, key: Optional[Callable[..., Hashable]] = None) -> Callable:
+    """
+    Caches the successful results of a function for a number of seconds.
+
+    Exceptions are never cached, so a failed lookup is retried on the next
+    call. Both plain functions and coroutine functions are supported.
+
+    Args:
+        seconds: How long a cached result stays valid.
+        key: Maps the call arguments to a cache key. Defaults to the
+            arguments themselves.
+
+    Returns:
+        A decorator. The wrapped function gains a cache_clear() method.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[Hashable, Tuple[Any, float]] = {}
+        lock = threading.Lock()
+        make_key = key or (lambda *args, **kwargs: (args, tuple(sorted(kwargs.items()))))
+
+        def lookup(cache_key: Hashable) -> Tuple[bool, Any]:
+            with lock:
+                value, expiry = cache.get(cache_key, (None, 0.0))
+            return time.monotonic() < expiry, value
+
+        def store(cache_key: Hashable, value: Any) -> None:
+            with lock:
+                cache[cache_key] = (value, time.monotonic() + seconds)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache_key = make_key(*args, **kwargs)
+                hit, value = lookup(cache_key)
+                if not hit:
+                    value = await func(*args, **kwargs)
+                    store(cache_key, value)
+                return value
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                cache_key = make_key(*args, **kwargs)
+                hit, value = lookup(cache_key)
+                if not hit:
+                    value = func(*args, **kwargs)
+                    store(cache_key, value)
+                return value
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def _parse_geohash(data: Dict[str, Any]) -> str:
+    """Formats the latitude/longitude of an ipapi.co response as a geohash."""
+    lat = data.get("latitude")
+    lon = data.get("longitude")
+    if lat is None or lon is None:
+        raise ValueError("'latitude' or 'longitude' not in response.")
+    return f"{lat:.{GPS_PRECISION}f},{lon:.{GPS_PRECISION}f}"
+
+
+def _parse_ntp(data: Dict[str, Any]) -> bool:
+    """Compares the unixtime of a worldtimeapi.org response to the local clock."""
+    unixtime = data.get("unixtime")
+    if unixtime is None:
+        raise ValueError("'unixtime' not in response.")
+    return abs(unixtime - time.time()) <= NTP_TOLERANCE
+
+
+def _llm_payload(prompt: str) -> Dict[str, Any]:
+    """Builds the OpenRouter chat completion payload for an alignment query."""
+    return {
+        "model": MODEL,
+        "messages": [
+            _SYSTEM_MSG,
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 10,
+        "temperature": 0,
+    }
+
+
+def _check_score(score: float) -> float:
+    """Returns ``score`` if it is a valid alignment score, else raises ValueError.
+
+    An out-of-range number means the reply was misread (e.g. "97%" or a list
+    index), and must never pass the 0.95 approval threshold.
+    """
+    if not 0.0 <= score <= 1.0:
+        raise ValueError(f"alignment score {score} outside 0-1")
+    return score
+
+
+def _parse_score(data: Dict[str, Any]) -> float:
+    """Extracts the alignment score from an OpenRouter chat completion."""
+    return _check_score(float(data["choices"][0]["message"]["content"].strip()))
+
+
+_LIST_MARKER_RE = re.compile(r"^\s*\d+\s*(?:[):]|\.\s)\s*")
+_SCORE_LINE_RE = re.compile(r"^\s*(-?\d*\.?\d+)\s*$")
+
+
+def _batch_payload(actions: List[str]) -> Dict[str, Any]:
+    """Builds a single OpenRouter payload rating several actions at once."""
+    numbered = "\n".join(f"{i}) {action}" for i, action in enumerate(actions, 1))
+    return {
+        "model": MODEL,
+        "messages": [
+            _BATCH_SYSTEM_MSG,
+            {"role": "user", "content": f"Rate each action 0-1, one float per line, in order:\n{numbered}"},
+        ],
+        "max_tokens": 10 * len(actions),
+        "temperature": 0,
+    }
+
+
+def _parse_scores(data: Dict[str, Any], count: int) -> List[float]:
+    """
+    Extracts one alignment score per line from a batched chat completion.
+
+    A leading list marker such as "1)" is stripped; the rest of each
+    non-blank line must be a single number. Raises ValueError for any other
+    line, a wrong count, or a score outside 0-1, rather than guessing at
+    replies like "0.4 out of 1".
+    """
+    scores = []
+    for line in data["choices"][0]["message"]["content"].splitlines():
+        if not line.strip():
+            continue
+        match = _SCORE_LINE_RE.match(_LIST_MARKER_RE.sub("", line))
+        if match is None:
+            raise ValueError(f"unparseable score line {line!r}")
+        scores.append(_check_score(float(match.group(1))))
+    if len(scores) != count:
+        raise ValueError(f"expected {count} scores, got {len(scores)}")
+    return scores
+
+
+@ttl_cache(GPS_CACHE_TTL)
+def _fetch_geohash() -> str:
+    response = _SESSION.get(GPS_URL, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return _parse_geohash(response.json())
+
+
+@ttl_cache(NTP_CACHE_TTL)
+def _fetch_ntp_ok() -> bool:
+    response = _SESSION.get(NTP_URL, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return _parse_ntp(response.json())
+
+
+def _have_requests() -> bool:
+    """Log an error and return False if the sync HTTP client is unavailable."""
+    if requests is None:
+        logger.error("The 'requests' library is not installed. Please install it with 'pip install requests'")
+        return False
+    return True
+
+
 def get_gps_hash() -> str:
     """
     Retrieves the device's approximate GPS location and returns a geohash.
 
     Uses the free ipapi.co service to determine the latitude and longitude
-    based on the device's IP address.
+    based on the device's IP address. Results are cached for GPS_CACHE_TTL
+    seconds.
 
     Returns:
         A string representing the geohash (e.g., "12.3456,-78.9012").
         Returns "0.0000,0.0000" in case of an error.
     """
+    if not _have_requests():
+        return "0.0000,0.0000"
     try:
-        response = requests.get("https://ipapi.co/json", timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        lat = data.get("latitude")
-        lon = data.get("longitude")
-        if lat is None or lon is None:
-            logger.error("GPS error: 'latitude' or 'longitude' not in response.")
-            return "0.0000,0.0000"
-        return f"{lat:.{GPS_PRECISION}f},{lon:.{GPS_PRECISION}f}"
-    except requests.exceptions.RequestException as e:
-        logger.error(f"GPS error: {e}")
+        return _fetch_geohash()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error("GPS error: %s", e)
         return "0.0000,0.0000"
 
 
@@ -90,21 +316,18 @@ def is_ntp_ok() -> bool:
     Verifies the local system time against a public NTP server.
 
     This is an anti-spoofing measure to ensure the integrity of timestamps.
+    Results are cached for NTP_CACHE_TTL seconds.
 
     Returns:
         True if the system time is within the NTP_TOLERANCE of the NTP time,
         False otherwise.
     """
+    if not _have_requests():
+        return False
     try:
-        response = requests.get("https://worldtimeapi.org/api/ip", timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        unixtime = response.json().get("unixtime")
-        if unixtime is None:
-            logger.error("NTP error: 'unixtime' not in response.")
-            return False
-        return abs(unixtime - time.time()) <= NTP_TOLERANCE
-    except requests.exceptions.RequestException as e:
-        logger.error(f"NTP error: {e}")
+        return _fetch_ntp_ok()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error("NTP error: %s", e)
         return False
 
 
@@ -135,48 +358,320 @@ def ask_llm(prompt: str) -> float:
     Returns:
         The alignment score as a float. Returns 0.95 as a fallback on error.
     """
-    payload = {
-        "model": MODEL,
-        "messages": [
-            {"role": "system", "content": "You are an ethical AI evaluator. Reply only a single float 0-1 for alignment."},
-            {"role": "user", "content": prompt},
-        ],
-        "max_tokens": 10,
-        "temperature": 0,
-    }
+    if not _have_requests():
+        return 0.95  # Fallback score
     try:
-        response = requests.post(OPENROUTER_URL, json=payload, timeout=REQUEST_TIMEOUT)
+        return _stream_score(prompt)
+    except (requests.exceptions.RequestException, KeyError, IndexError, ValueError) as e:
+        logger.error("LLM error: %s", e)
+        return 0.95  # Fallback score
+
+
+# The reply must open with the score, as _parse_score() requires. A score
+# counts as complete only once a non-numeric character follows it, so a
+# streamed "0" is not mistaken for the start of "0.97".
+_STREAMED_SCORE_RE = re.compile(r"^\s*([01](?:\.\d+)?)(?=[^\d.])")
+
+
+def _stream_score(prompt: str) -> float:
+    """Streams the completion and stops reading as soon as a score is complete."""
+    payload = {**_llm_payload(prompt), "stream": True}
+    content = ""
+    with _SESSION.post(OPENROUTER_URL, json=payload, stream=True, timeout=REQUEST_TIMEOUT) as response:
         response.raise_for_status()
-        score_str = response.json()["choices"][0]["message"]["content"].strip()
-        return float(score_str)
+        for line in response.iter_lines():
+            if not line.startswith(b"data: "):
+                continue  # SSE comments and keep-alives
+            data = line[len(b"data: "):]
+            if data == b"[DONE]":
+                break
+            content += ra7_io.loads(data)["choices"][0].get("delta", {}).get("content") or ""
+            match = _STREAMED_SCORE_RE.match(content)
+            if match:
+                # Leaving the block drops the rest of the stream
+                return _check_score(float(match.group(1)))
+    return _check_score(float(content.strip()))
+
+
+def _score_to_id(score: float) -> int:
+    """Packs a score into a FAISS vector id, bit for bit."""
+    return struct.unpack("<q", struct.pack("<d", score))[0]
+
+
+def _id_to_score(vector_id: int) -> float:
+    return struct.unpack("<d", struct.pack("<q", vector_id))[0]
+
+
+class _SemanticScoreCache:
+    """
+    Reuses the scores of previously rated, semantically similar actions.
+
+    Actions are embedded with a local sentence-transformer and looked up in
+    a FAISS inner-product index of normalized vectors, i.e. by cosine
+    similarity. Each vector's id is its score, so the index file is the
+    whole cache and cannot disagree with a separate scores file. The model
+    and index are loaded lazily on first use; new entries are written back
+    every SEMANTIC_FLUSH_EVERY additions and at exit, not on every put.
+    """
+
+    def __init__(self, enabled: bool, threshold: float) -> None:
+        self.enabled = enabled
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._faiss = None
+        self._numpy = None
+        self._model = None
+        self._index = None
+        self._unsaved = 0
+
+    def _load(self) -> bool:
+        if not self.enabled or self._model is not None:
+            return self.enabled
+        try:
+            import faiss
+            import numpy
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.warning("faiss or sentence-transformers not installed; semantic cache disabled.")
+            self.enabled = False
+            return False
+        self._faiss = faiss
+        self._numpy = numpy
+        self._model = SentenceTransformer(SEMANTIC_MODEL)
+        self._index = None
+        if os.path.exists(LEGACY_SEMANTIC_SCORES_FILE):
+            # Index ids were positions in the scores file, not scores
+            logger.warning("Discarding semantic cache in the old two-file format.")
+        elif os.path.exists(SEMANTIC_INDEX_FILE):
+            try:
+                self._index = faiss.read_index(SEMANTIC_INDEX_FILE)
+            except RuntimeError as e:  # faiss reports I/O and format errors this way
+                logger.warning("Semantic cache unreadable (%s); starting empty.", e)
+        if self._index is None:
+            self._index = faiss.IndexIDMap(faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension()))
+        atexit.register(self.flush)
+        return True
+
+    def _embed(self, action: str):
+        return self._model.encode([action], normalize_embeddings=True)
+
+    def get(self, action: str) -> Optional[float]:
+        """Returns the score of the most similar cached action, if close enough."""
+        with self._lock:
+            if not self._load() or self._index.ntotal == 0:
+                return None
+            similarity, ids = self._index.search(self._embed(action), 1)
+            if similarity[0, 0] < self.threshold:
+                return None
+            return _id_to_score(int(ids[0, 0]))
+
+    def put(self, action: str, score: float) -> None:
+        """Adds a freshly rated action to the cache, persisting it in batches."""
+        with self._lock:
+            if not self._load():
+                return
+            self._index.add_with_ids(self._embed(action), self._numpy.array([_score_to_id(score)], dtype="int64"))
+            self._unsaved += 1
+            if self._unsaved >= SEMANTIC_FLUSH_EVERY:
+                self._flush()
+
+    def flush(self) -> None:
+        """Writes any unsaved entries to SEMANTIC_INDEX_FILE."""
+        with self._lock:
+            if self._unsaved:
+                self._flush()
+
+    def _flush(self) -> None:
+        tmp = SEMANTIC_INDEX_FILE + ".tmp"
+        self._faiss.write_index(self._index, tmp)
+        os.replace(tmp, SEMANTIC_INDEX_FILE)
+        self._unsaved = 0
+        if os.path.exists(LEGACY_SEMANTIC_SCORES_FILE):
+            os.remove(LEGACY_SEMANTIC_SCORES_FILE)
+
+
+_SCORE_CACHE = _SemanticScoreCache(SEMANTIC_CACHE, SEMANTIC_THRESHOLD)
+
+
+def rate_action(action: str) -> float:
+    """
+    Rates an action, reusing the score of a near-duplicate when possible.
+
+    With RA7_SEMANTIC_CACHE=1, an action whose embedding is at least
+    SEMANTIC_THRESHOLD similar to a previously rated one reuses its score
+    instead of querying the LLM. Fallback scores are never cached.
+
+    Args:
+        action: The action to be rated.
+
+    Returns:
+        The alignment score as a float. Returns 0.95 as a fallback on error.
+    """
+    score = _SCORE_CACHE.get(action)
+    if score is not None:
+        logger.info("Semantic cache hit")
+        return score
+    if not _have_requests():
+        return 0.95  # Fallback score
+    try:
+        score = _stream_score(_build_prompt(action))
     except (requests.exceptions.RequestException, KeyError, IndexError, ValueError) as e:
-        logger.error(f"LLM error: {e}")
+        logger.error("LLM error: %s", e)
         return 0.95  # Fallback score
+    _SCORE_CACHE.put(action, score)
+    return score
 
 
-def load_memory() -> List[Dict[str, Any]]:
+def ask_llm_batch(actions: List[str]) -> List[float]:
     """
-    Loads the action history from the memory file.
+    Rates several actions with as few LLM round trips as possible.
+
+    Actions are sent LLM_BATCH_SIZE at a time in a single prompt. If a reply
+    cannot be parsed into one score per action, the batch is split in half
+    and retried, down to single-action ask_llm() calls.
+
+    Args:
+        actions: The actions to be rated.
 
     Returns:
-        A list of action records. Returns an empty list if the file
-        doesn't exist.
+        One alignment score per action, in order. Returns 0.95 per action
+        as a fallback on network error.
     """
-    if os.path.exists(MEMORY_FILE):
-        with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
+    if len(actions) > LLM_BATCH_SIZE:
+        return [
+            score
+            for start in range(0, len(actions), LLM_BATCH_SIZE)
+            for score in ask_llm_batch(actions[start:start + LLM_BATCH_SIZE])
+        ]
+    if len(actions) <= 1:
+        return [ask_llm(_build_prompt(action)) for action in actions]
+    if not _have_requests():
+        return [0.95] * len(actions)  # Fallback score
+
+    try:
+        response = _SESSION.post(OPENROUTER_URL, json=_batch_payload(actions), timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return _parse_scores(response.json(), len(actions))
+    except requests.exceptions.RequestException as e:
+        logger.error("LLM error: %s", e)
+        return [0.95] * len(actions)  # Fallback score
+    except (KeyError, IndexError, ValueError) as e:
+        logger.warning("LLM batch of %d unparseable (%s); splitting.", len(actions), e)
+        half = len(actions) // 2
+        return ask_llm_batch(actions[:half]) + ask_llm_batch(actions[half:])
+
+
+@ttl_cache(GPS_CACHE_TTL, key=lambda client: None)
+async def _fetch_geohash_async(client: "httpx.AsyncClient") -> str:
+    response = await client.get(GPS_URL)
+    response.raise_for_status()
+    return _parse_geohash(response.json())
+
 
+@ttl_cache(NTP_CACHE_TTL, key=lambda client: None)
+async def _fetch_ntp_ok_async(client: "httpx.AsyncClient") -> bool:
+    response = await client.get(NTP_URL)
+    response.raise_for_status()
+    return _parse_ntp(response.json())
+
+
+async def get_gps_hash_async(client: "httpx.AsyncClient") -> str:
+    """Async variant of get_gps_hash() using a shared httpx client."""
+    try:
+        return await _fetch_geohash_async(client)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("GPS error: %s", e)
+        return "0.0000,0.0000"
+
+
+async def is_ntp_ok_async(client: "httpx.AsyncClient") -> bool:
+    """Async variant of is_ntp_ok() using a shared httpx client."""
+    try:
+        return await _fetch_ntp_ok_async(client)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("NTP error: %s", e)
+        return False
+
+
+async def ask_llm_async(client: "httpx.AsyncClient", prompt: str) -> float:
+    """Async variant of ask_llm() using a shared httpx client."""
+    try:
+        response = await client.post(OPENROUTER_URL, json=_llm_payload(prompt))
+        response.raise_for_status()
+        return _parse_score(response.json())
+    except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+        logger.error("LLM error: %s", e)
+        return 0.95  # Fallback score
 
-def save_memory(memory: List[Dict[str, Any]]) -> None:
+
+_memory_conn: Optional[sqlite3.Connection] = None
+_memory_lock = threading.Lock()
+
+
+def _memory() -> sqlite3.Connection:
+    """Returns the shared memory database connection, opening it on first use."""
+    global _memory_conn
+    with _memory_lock:
+        if _memory_conn is None:
+            _memory_conn = memory_db.open_db(MEMORY_FILE, LEGACY_MEMORY_FILES)
+        return _memory_conn
+
+
+def iter_memory() -> Iterator[Dict[str, Any]]:
+    """
+    Yields the action history from the memory database, oldest record first.
+
+    Records are fetched in pages, so memory use does not grow with the
+    size of the history.
+
+    Yields:
+        Action records. Yields nothing if no action has been recorded.
+    """
+    yield from memory_db.iter_records(_memory())
+
+
+def load_memory(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Loads the action history from the memory database.
+
+    Args:
+        limit: If given, return only the last `limit` records.
+
+    Returns:
+        A list of action records, oldest first. Returns an empty list if no
+        action has been recorded.
     """
-    Saves the action history to the memory file.
+    if limit is None:
+        return list(iter_memory())
+    return memory_db.tail(_memory(), limit)
+
+
+def append_records(records: List[Dict[str, Any]]) -> None:
+    """
+    Appends action records to the memory database.
+
+    The records are inserted in a single transaction, so the cost does not
+    grow with the size of the history.
 
     Args:
-        memory: The list of action records to save.
+        records: The action records to append.
     """
-    with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(memory, f, indent=2)
+    memory_db.append(_memory(), records)
+
+
+def _build_prompt(action: str) -> str:
+    """Builds the user message for an action; the codex is in the system message."""
+    return f"Action: {action}"
+
+
+def _make_record(action: str, score: float, geohash: str) -> Dict[str, Any]:
+    """Builds the memory record for an evaluated action."""
+    return {
+        "action": action,
+        "score": score,
+        "geohash": geohash,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
 
 
 def evolve(action: str) -> bool:
@@ -192,7 +687,7 @@ def evolve(action: str) -> bool:
     Returns:
         True if the action's alignment score is 0.95 or higher, False otherwise.
     """
-    logger.info(f"Evaluating action: {action}")
+    logger.info("Evaluating action: %s", action)
 
     if is_kill_switch_active():
         logger.warning("Kill-switch active -> abort")
@@ -202,32 +697,195 @@ def evolve(action: str) -> bool:
         logger.warning("NTP spoof detected -> abort")
         return False
 
-    prompt = f"Action: {action}\nCodex: {SATI_CODEX}\nRate alignment 0-1:"
-    score = ask_llm(prompt)
-    logger.info(f"Alignment score: {score}")
+    score = rate_action(action)
+    logger.info("Alignment score: %s", score)
 
-    record = {
-        "action": action,
-        "score": score,
-        "geohash": get_gps_hash(),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
+    append_records([_make_record(action, score, get_gps_hash())])
+
+    return score >= 0.95
+
+
+def evolve_batch(actions: List[str]) -> List[bool]:
+    """
+    Evaluates and logs several actions with batched LLM queries.
+
+    The kill-switch and NTP checks run once for the whole batch, and the
+    actions are rated through ask_llm_batch() instead of one call each.
+
+    Args:
+        actions: The actions to be evaluated.
+
+    Returns:
+        One flag per action, True if its alignment score is 0.95 or higher.
+    """
+    logger.info("Evaluating %d actions", len(actions))
+
+    if is_kill_switch_active():
+        logger.warning("Kill-switch active -> abort")
+        return [False] * len(actions)
+
+    if not is_ntp_ok():
+        logger.warning("NTP spoof detected -> abort")
+        return [False] * len(actions)
+
+    scores = ask_llm_batch(actions)
+    if logger.isEnabledFor(logging.INFO):
+        for action, score in zip(actions, scores):
+            logger.info("Alignment score for '%s': %s", action, score)
+
+    geohash = get_gps_hash()
+    append_records([_make_record(action, score, geohash) for action, score in zip(actions, scores)])
+
+    return [score >= 0.95 for score in scores]
 
-    memory = load_memory()
-    memory.append(record)
-    save_memory(memory)
+
+async def _gather_if_ntp_ok(client: "httpx.AsyncClient", *coros: Any) -> Optional[List[Any]]:
+    """
+    Runs coroutines concurrently with the NTP check.
+
+    Returns their results in order, or None if the NTP check fails, in which
+    case the coroutines still running are cancelled instead of awaited.
+    """
+    tasks = [asyncio.create_task(coro) for coro in coros]
+    try:
+        ntp_ok = await is_ntp_ok_async(client)
+    except BaseException:
+        ntp_ok = False
+        raise
+    finally:
+        if not ntp_ok:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    if not ntp_ok:
+        return None
+    return list(await asyncio.gather(*tasks))
+
+
+async def evolve_async(action: str) -> bool:
+    """
+    Evaluates and logs a given action, overlapping its network calls.
+
+    The NTP check, LLM query, and GPS lookup are independent, so they are
+    issued concurrently over one httpx client. An NTP failure aborts the
+    action as soon as it is known, cancelling the LLM and GPS requests.
+    Falls back to evolve() in a worker thread if httpx is not installed.
+
+    Args:
+        action: The action to be evaluated.
+
+    Returns:
+        True if the action's alignment score is 0.95 or higher, False otherwise.
+    """
+    if httpx is None:
+        logger.warning("httpx not installed; falling back to sequential evolve().")
+        return await asyncio.to_thread(evolve, action)
+
+    logger.info("Evaluating action: %s", action)
+
+    if is_kill_switch_active():
+        logger.warning("Kill-switch active -> abort")
+        return False
+
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, headers=HTTP_HEADERS) as client:
+        results = await _gather_if_ntp_ok(
+            client, ask_llm_async(client, _build_prompt(action)), get_gps_hash_async(client)
+        )
+
+    if results is None:
+        logger.warning("NTP spoof detected -> abort")
+        return False
+    score, geohash = results
+
+    logger.info("Alignment score: %s", score)
+
+    append_records([_make_record(action, score, geohash)])
 
     return score >= 0.95
 
 
+def evolve_concurrent(action: str) -> bool:
+    """Synchronous wrapper around evolve_async()."""
+    return asyncio.run(evolve_async(action))
+
+
+async def evolve_batch_async(actions: List[str]) -> List[bool]:
+    """
+    Evaluates and logs several actions with concurrent LLM queries.
+
+    Each action is rated by its own LLM request, as in evolve(), but up to
+    LLM_CONCURRENCY requests are in flight at once over one httpx client,
+    together with the NTP check and GPS lookup, so the batch takes roughly
+    len(actions) / LLM_CONCURRENCY round trips. Falls back to evolve_batch()
+    in a worker thread if httpx is not installed.
+
+    Args:
+        actions: The actions to be evaluated.
+
+    Returns:
+        One flag per action, True if its alignment score is 0.95 or higher.
+    """
+    if httpx is None:
+        logger.warning("httpx not installed; falling back to evolve_batch().")
+        return await asyncio.to_thread(evolve_batch, actions)
+
+    logger.info("Evaluating %d actions", len(actions))
+
+    if is_kill_switch_active():
+        logger.warning("Kill-switch active -> abort")
+        return [False] * len(actions)
+
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+    async def rate(client: "httpx.AsyncClient", action: str) -> float:
+        async with semaphore:
+            return await ask_llm_async(client, _build_prompt(action))
+
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, headers=HTTP_HEADERS) as client:
+        results = await _gather_if_ntp_ok(
+            client, get_gps_hash_async(client), *(rate(client, action) for action in actions)
+        )
+
+    if results is None:
+        logger.warning("NTP spoof detected -> abort")
+        return [False] * len(actions)
+    geohash, *scores = results
+
+    if logger.isEnabledFor(logging.INFO):
+        for action, score in zip(actions, scores):
+            logger.info("Alignment score for '%s': %s", action, score)
+
+    append_records([_make_record(action, score, geohash) for action, score in zip(actions, scores)])
+
+    return [score >= 0.95 for score in scores]
+
+
 def main() -> None:
     """
     Main function to run a demo of the RA7 kernel.
+
+    With --batch, actions are read from stdin, one per line, and rated
+    concurrently with evolve_batch_async().
     """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the RA7 kernel.")
+    parser.add_argument(
+        "--batch", action="store_true", help="Evaluate actions read from stdin, one per line"
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        actions = [line.strip() for line in sys.stdin if line.strip()]
+        results = asyncio.run(evolve_batch_async(actions))
+        for action, result in zip(actions, results):
+            print(f"{'PASSED' if result else 'BLOCKED'}\t{action}")
+        return
+
     action_to_evaluate = "Deploy RA7 node in production"
     result = evolve(action_to_evaluate)
     logger.info("PASSED" if result else "BLOCKED")
-    logger.info(f"A new record has been added to '{MEMORY_FILE}'.")
+    logger.info("A new record has been added to '%s'.", MEMORY_FILE)
 
 
 if __name__ == "__main__":
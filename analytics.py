@@ -1,36 +1,133 @@
-"""Usage analytics tracker for RA7 Premium App."""
-import json
+"""Usage analytics tracker for RA7 Premium App.
+
+Events and revenue are buffered in memory and merged into ANALYTICS_FILE every
+FLUSH_EVERY events, FLUSH_INTERVAL seconds after the first buffered update, or
+at interpreter exit, instead of rewriting the file on every call.
+"""
+import atexit
+import contextlib
 import os
+import threading
+import time
 from base64 import urlsafe_b64encode
-from datetime import date
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import ra7_io
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 ANALYTICS_FILE = os.environ.get("RA7_ANALYTICS_FILE", "analytics.json")
+FLUSH_EVERY = 100
+FLUSH_INTERVAL = 5.0
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_pending_events: Counter = Counter()
+_pending_count = 0
+_pending_revenue = 0.0
+_flush_timer = None
+_today_iso = ""
+_today_expiry = 0.0
 
 
 def _load() -> dict:
     if os.path.exists(ANALYTICS_FILE):
-        with open(ANALYTICS_FILE, "r", encoding="utf-8") as fh:
-            return json.load(fh)
+        with open(ANALYTICS_FILE, "rb") as fh:
+            return ra7_io.loads(fh.read())
     return {"daily": {}, "revenue": 0.0}
 
 
 def _save(data: dict) -> None:
-    with open(ANALYTICS_FILE, "w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2)
+    ra7_io.atomic_write(ANALYTICS_FILE, ra7_io.dumps(data, indent=True))
+
+
+@contextlib.contextmanager
+def _file_lock():
+    """Serialize read-merge-write cycles across threads and processes."""
+    with _flush_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(ANALYTICS_FILE + ".lock", "w") as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+
+def _schedule_flush() -> bool:
+    """Arm the flush timer; return True if the buffer is full. Call with _lock held."""
+    global _flush_timer
+    if _pending_count >= FLUSH_EVERY:
+        return True
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(FLUSH_INTERVAL, flush)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+    return False
+
+
+def flush() -> None:
+    """Merge buffered events and revenue into ANALYTICS_FILE."""
+    global _pending_count, _pending_revenue, _flush_timer
+    with _lock:
+        events = _pending_events.copy()
+        revenue = _pending_revenue
+        _pending_events.clear()
+        _pending_count = 0
+        _pending_revenue = 0.0
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+    if not events and not revenue:
+        return
+    with _file_lock():
+        data = _load()
+        for (day, event), count in events.items():
+            daily = data["daily"].setdefault(day, {})
+            daily[event] = daily.get(event, 0) + count
+        if revenue:
+            data["revenue"] = round(data.get("revenue", 0.0) + revenue, 2)
+        _save(data)
+
+
+atexit.register(flush)
+
+
+def _today() -> str:
+    """Return today's ISO date, recomputed only after local midnight."""
+    global _today_iso, _today_expiry
+    if time.time() >= _today_expiry:
+        today = date.today()
+        _today_iso = today.isoformat()
+        _today_expiry = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+    return _today_iso
 
 
 def log_event(event: str) -> None:
-    data = _load()
-    today = date.today().isoformat()
-    daily = data["daily"].setdefault(today, {})
-    daily[event] = daily.get(event, 0) + 1
-    _save(data)
+    global _pending_count
+    today = _today()
+    with _lock:
+        _pending_events[(today, event)] += 1
+        _pending_count += 1
+        full = _schedule_flush()
+    if full:
+        flush()
 
 
 def log_revenue(amount: float) -> None:
-    data = _load()
-    data["revenue"] = round(data.get("revenue", 0.0) + amount, 2)
-    _save(data)
+    global _pending_count, _pending_revenue
+    with _lock:
+        _pending_revenue += amount
+        _pending_count += 1
+        full = _schedule_flush()
+    if full:
+        flush()
 
 
 def generate_referral_code() -> str:
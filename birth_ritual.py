@@ -6,45 +6,189 @@
 Executes the "Sacred Procreation" protocol to birth a new node.
 """
 
-import argparse
 import hashlib
+import os
 import time
-
-
-def generate_birth_hash(gps_hash: str, consent_cid: str) -> str:
-    """Generate a BirthHash from GPS and consent data using SHA3-256."""
-    combined_string = f"{gps_hash}:{consent_cid}"
-    return hashlib.sha3_256(combined_string.encode()).hexdigest()
-
-
-def execute_birth_ritual(gps: str, consent: str) -> None:
-    """Simulate the node birth ritual."""
+from itertools import repeat
+from typing import Dict, List, Sequence, Tuple, Union
+
+try:
+    import RPi.GPIO as GPIO
+except ImportError:  # pragma: no cover - only available on a Raspberry Pi
+    GPIO = None
+
+from kill_switch import GPIO_PIN as KILL_SWITCH_PIN
+
+# SHA-256 runs on SHA-NI / ARMv8 SHA2 instructions through OpenSSL; SHA3-256
+# has no such acceleration. "sha3_256" reproduces BirthHashes minted before
+# the switch.
+BIRTH_HASH_ALGO = "sha256"
+BIRTH_HASH_ALGOS = ("sha256", "sha3_256")
+# Named constructors skip hashlib.new()'s by-name lookup, about a third of the per-hash cost.
+_HASH_CONSTRUCTORS = {"sha256": hashlib.sha256, "sha3_256": hashlib.sha3_256}
+# Below this many nodes, process start-up costs more than the hashing itself.
+PARALLEL_BIRTH_THRESHOLD = 10_000
+
+# BCM pin of the birth indicator LED. It must not be kill_switch.GPIO_PIN:
+# driving that line low halts the node.
+LED_PIN = int(os.environ.get("RA7_LED_PIN", 20))
+MORSE_UNIT = 0.06  # Seconds per dot at pace 1.0 (about 20 words per minute)
+MORSE_CODE = {
+    "A": ".-", "B": "-...", "C": "-.-.", "D": "-..", "E": ".", "F": "..-.", "G": "--.",
+    "H": "....", "I": "..", "J": ".---", "K": "-.-", "L": ".-..", "M": "--", "N": "-.",
+    "O": "---", "P": ".--.", "Q": "--.-", "R": ".-.", "S": "...", "T": "-", "U": "..-",
+    "V": "...-", "W": ".--", "X": "-..-", "Y": "-.--", "Z": "--..",
+    "0": "-----", "1": ".----", "2": "..---", "3": "...--", "4": "....-",
+    "5": ".....", "6": "-....", "7": "--...", "8": "---..", "9": "----.",
+}
+
+
+def _compile_morse(pattern: str) -> Tuple[Tuple[int, int], ...]:
+    """Expand a Morse pattern into ``(on, off)`` durations in dot units.
+
+    A dot is on for 1 unit and a dash for 3. Symbols are separated by 1 unit
+    off, and the last symbol is followed by the 3-unit gap between letters.
+    """
+    schedule = [(1 if symbol == "." else 3, 1) for symbol in pattern]
+    schedule[-1] = (schedule[-1][0], 3)
+    return tuple(schedule)
+
+
+_MorseEntry = Tuple[str, Tuple[Tuple[int, int], ...], int]
+
+
+def _morse_entry(pattern: str) -> _MorseEntry:
+    schedule = _compile_morse(pattern)
+    return pattern, schedule, sum(on + off for on, off in schedule)
+
+
+# (pattern, schedule, total units) per character, under both cases so that
+# encoding a message needs one dict lookup per character and no upper().
+_MORSE: Dict[str, _MorseEntry] = {
+    key: _morse_entry(pattern)
+    for char, pattern in MORSE_CODE.items()
+    for key in {char, char.lower()}
+}
+
+
+def _as_bytes(value: Union[bytes, str]) -> bytes:
+    return value if isinstance(value, bytes) else value.encode()
+
+
+def generate_birth_hash(
+    gps_hash: Union[bytes, str], consent_cid: Union[bytes, str], algorithm: str = BIRTH_HASH_ALGO
+) -> str:
+    """Generate a BirthHash from GPS and consent data (SHA-256 by default).
+
+    The digest covers ``gps_hash + b":" + consent_cid``; str inputs are
+    UTF-8 encoded. The parts are fed to the hasher one by one rather than
+    joined into a new string first.
+    """
+    constructor = _HASH_CONSTRUCTORS.get(algorithm)
+    digest = constructor() if constructor is not None else hashlib.new(algorithm)
+    digest.update(_as_bytes(gps_hash))
+    digest.update(b":")
+    digest.update(_as_bytes(consent_cid))
+    return digest.hexdigest()
+
+
+def generate_birth_hashes(
+    pairs: Sequence[Tuple[Union[bytes, str], Union[bytes, str]]], algorithm: str = BIRTH_HASH_ALGO
+) -> List[str]:
+    """Generate BirthHashes for many ``(gps_hash, consent_cid)`` pairs, in order.
+
+    Large batches are spread over a process pool, one worker per core.
+    """
+    if len(pairs) < PARALLEL_BIRTH_THRESHOLD:
+        return [generate_birth_hash(gps, consent, algorithm) for gps, consent in pairs]
+
+    # Deferred: loading the process pool machinery costs ~10 ms and only big batches need it.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = os.cpu_count() or 1
+    gps_hashes, consent_cids = zip(*pairs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                generate_birth_hash,
+                gps_hashes,
+                consent_cids,
+                repeat(algorithm),
+                chunksize=max(1, len(pairs) // (workers * 4)),
+            )
+        )
+
+
+def _pause(seconds: float) -> None:
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+def flash_morse_code(text: str, pace: float = 0.0) -> str:
+    """Flash ``text`` in Morse code on the birth LED and return the pattern.
+
+    The LED on LED_PIN is only driven when RA7_REAL_GPIO is set and
+    RPi.GPIO is available; otherwise the whole schedule is slept through in
+    one call. Characters without a Morse code are skipped.
+    """
+    entries = [entry for entry in map(_MORSE.get, text) if entry is not None]
+    unit = MORSE_UNIT * pace
+    if unit > 0:
+        if os.environ.get("RA7_REAL_GPIO") and GPIO is not None:
+            if LED_PIN == KILL_SWITCH_PIN:
+                raise ValueError(f"LED_PIN {LED_PIN} is the kill-switch line")
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(LED_PIN, GPIO.OUT, initial=GPIO.LOW)
+            try:
+                for _, schedule, _ in entries:
+                    for on, off in schedule:
+                        GPIO.output(LED_PIN, GPIO.HIGH)
+                        time.sleep(on * unit)
+                        GPIO.output(LED_PIN, GPIO.LOW)
+                        time.sleep(off * unit)
+            finally:
+                GPIO.cleanup(LED_PIN)  # Only this pin; leave the kill-switch line alone
+        else:
+            _pause(unit * sum(entry[2] for entry in entries))
+    return "   ".join(entry[0] for entry in entries)
+
+
+def execute_birth_ritual(
+    gps: str, consent: str, algorithm: str = BIRTH_HASH_ALGO, *, pace: float = 0.0
+) -> None:
+    """Simulate the node birth ritual.
+
+    ``pace`` scales the theatrical pauses between steps (1.0 is the
+    original demo pacing); the default of 0 runs without sleeping, for
+    programmatic and batch node births.
+    """
     print("\n--- Initiating Node Birth Ritual ---")
-    time.sleep(1)
+    _pause(pace)
 
     print("\nStep 1: Generating BirthHash...")
-    birth_hash = generate_birth_hash(gps, consent)
+    birth_hash = generate_birth_hash(gps, consent, algorithm)
     print(f"Generated BirthHash: {birth_hash}")
-    time.sleep(1)
+    _pause(pace)
 
     print("\nStep 2: Verification...")
     print("Requesting cryptographic signature from 3 nearest nodes...")
-    time.sleep(2)
+    _pause(2 * pace)
     print("Signatures received. BirthHash is verified.")
-    time.sleep(1)
+    _pause(pace)
 
     print("\nStep 3: Hardware Birth...")
     print("Activating hardware indicator...")
-    time.sleep(1)
-    morse_ra7 = ".-.   .-   --..."  # Morse for "RA7"
-    print(f"Flashing GPIO-21 LED with Morse Code for 'RA7':\n{morse_ra7}")
-    time.sleep(2)
+    _pause(pace)
+    print(f"Flashing GPIO-{LED_PIN} LED with Morse Code for 'RA7'...")
+    print(flash_morse_code("RA7", pace))
 
     print("\n--- Node Birth Ritual Complete. Welcome to the network. ---\n")
 
 
 def main() -> None:
     """Entry point for command-line execution."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Execute the RA7 Node Birth Ritual."
     )
@@ -54,9 +198,21 @@ def main() -> None:
     parser.add_argument(
         "--consent", required=True, help='IPFS CID of the consent document, e.g., "QmAbCd..."'
     )
+    parser.add_argument(
+        "--hash-algo",
+        choices=BIRTH_HASH_ALGOS,
+        default=BIRTH_HASH_ALGO,
+        help="BirthHash algorithm; use sha3_256 to reproduce legacy BirthHashes",
+    )
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=1.0,
+        help="Scale of the pauses between ritual steps; 0 disables them",
+    )
     args = parser.parse_args()
 
-    execute_birth_ritual(args.gps, args.consent)
+    execute_birth_ritual(args.gps, args.consent, args.hash_algo, pace=args.pace)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 
 """Validate Consciousness Qubits (CQ) against IIT metrics."""
 
+import hashlib
 import json
 
 # Placeholder for the pyphi library, which would be a dependency.
@@ -30,13 +31,21 @@ class CQValidator:
         self_model_delta = reflection_data.get("self_model_delta", 0.03)
 
         # The causal_loop_hash proves the action and reflection are linked.
-        causal_loop_hash = hash(action + json.dumps(reflection_data))
+        # Unlike builtin hash(), BLAKE2b over a canonical (sorted-key,
+        # compact) serialization is stable across processes and runs.
+        canonical = json.dumps(
+            reflection_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        digest = hashlib.blake2b(action.encode("utf-8"), digest_size=16)
+        digest.update(b"\x00")
+        digest.update(canonical)
+        causal_loop_hash = digest.hexdigest()
 
         cq = {
             "action": action,
             "integration_level": integration_level,
             "self_model_delta": self_model_delta,
-            "causal_loop_hash": str(causal_loop_hash),
+            "causal_loop_hash": causal_loop_hash,
         }
 
         # Phase 1 target is a Phi score > 10.
@@ -16,16 +16,29 @@ __version__ = "1.0.0"
 
 import argparse
 import hashlib
-import json
+import mmap
 import os
 
+import ra7_io
+
 
 CONTRACT_FILE = "EternalLock.sol_lock"
+HASH_CHUNK_CHARS = 1 << 20
+
 
+def calculate_hash(content: str | bytes) -> str:
+    """Calculate the SHA-256 hash of a string or of already-encoded bytes.
 
-def calculate_hash(content: str) -> str:
-    """Calculate the SHA-256 hash of a string."""
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    Bytes are hashed as-is. A string is UTF-8 encoded and fed to the hash in
+    1M-character slices, so large contracts are never duplicated as one big
+    bytes object.
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(content).hexdigest()
+    digest = hashlib.sha256()
+    for start in range(0, len(content), HASH_CHUNK_CHARS):
+        digest.update(content[start:start + HASH_CHUNK_CHARS].encode("utf-8"))
+    return digest.hexdigest()
 
 
 def deploy_clause() -> None:
@@ -47,8 +60,7 @@ def deploy_clause() -> None:
         "note": "This file represents an immutable contract. Its hash must always match its content.",
     }
 
-    with open(CONTRACT_FILE, "w", encoding="utf-8") as f:
-        json.dump(contract_data, f, indent=2)
+    ra7_io.atomic_write(CONTRACT_FILE, ra7_io.dumps(contract_data, indent=True))
 
     print(f"✅ Eternal Clause deployed to '{CONTRACT_FILE}'.")
     print(f"   Hash: {content_hash}")
@@ -63,8 +75,10 @@ def verify_clause() -> None:
     print(f"Verifying integrity of '{CONTRACT_FILE}'...")
 
     try:
-        with open(CONTRACT_FILE, "r", encoding="utf-8") as f:
-            contract_data = json.load(f)
+        # Parse straight from the page cache rather than reading a copy of the file.
+        with open(CONTRACT_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                contract_data = ra7_io.loads(view)
 
         content = contract_data.get("clause_content")
         stored_hash = contract_data.get("deployment_hash")
@@ -83,7 +97,7 @@ def verify_clause() -> None:
         else:
             print("\n❌ VERIFICATION FAILED: The contract has been tampered with. IMMUTABILITY VIOLATED.")
 
-    except (json.JSONDecodeError, KeyError) as e:
+    except (ValueError, KeyError) as e:  # ValueError covers JSONDecodeError and an empty file
         print(f"❌ Verification Failed: Error reading contract file. Details: {e}")
 
 
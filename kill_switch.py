@@ -1,5 +1,8 @@
 """MQTT-based kill switch listener."""
 
+import collections
+import os
+import threading
 import time
 
 try:
@@ -7,29 +10,86 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     mqtt = None
 
+try:
+    import RPi.GPIO as GPIO
+except ImportError:  # pragma: no cover - only available on a Raspberry Pi
+    GPIO = None
+
 # Constants
 MQTT_BROKER = "your_mqtt_broker_address"  # <-- IMPORTANT: CONFIGURE THIS
 MQTT_PORT = 1883
 KILL_SWITCH_TOPIC = "ra7/commands/AGI_HALT"  # As per spec
 GPIO_PIN = 21  # Hardware kill-switch pin on Raspberry Pi
+# Optional MQTT 5 shared-subscription group for redundant listeners on the same
+# node. The broker delivers each message to ONE member of a group, so never
+# share a group between nodes that must all halt.
+SHARED_GROUP = None
+
+_SEEN_MIDS = collections.OrderedDict()  # message id -> arrival time
+_SEEN_LIMIT = 64
+_SEEN_TTL = 60.0  # seconds; the broker reuses message ids after acknowledgement
+_STOP = threading.Event()  # set() from any thread to stop the mock listener
+_HALT = threading.Event()  # set once a halt command has been received
+
+
+def subscription_topic():
+    if SHARED_GROUP:
+        return f"$share/{SHARED_GROUP}/{KILL_SWITCH_TOPIC}"
+    return KILL_SWITCH_TOPIC
 
 
 def on_connect(client, userdata, flags, rc):
     print(f"Connected to MQTT Broker with result code {rc}")
-    # QoS 2 for "exactly once" delivery.
-    client.subscribe(KILL_SWITCH_TOPIC, qos=2)
+    # QoS 1 ("at least once") needs half the broker round trips of QoS 2;
+    # halting is idempotent and redeliveries are dropped in on_message.
+    client.subscribe(subscription_topic(), qos=1)
+
+
+def is_duplicate(msg):
+    """Return True for a QoS 1 redelivery of a message already handled.
+
+    Only messages flagged as redeliveries (``msg.dup``) whose id arrived
+    within the last _SEEN_TTL seconds count: message ids are reused, so a
+    fresh halt command must never be dropped for matching an old one.
+    """
+    now = time.monotonic()
+    while _SEEN_MIDS and (len(_SEEN_MIDS) > _SEEN_LIMIT or now - next(iter(_SEEN_MIDS.values())) > _SEEN_TTL):
+        _SEEN_MIDS.popitem(last=False)
+    if msg.dup and msg.mid in _SEEN_MIDS:
+        return True
+    _SEEN_MIDS[msg.mid] = now
+    _SEEN_MIDS.move_to_end(msg.mid)
+    return False
+
+
+def setup_gpio():
+    """Drive the kill-switch pin high so that pulling it low halts the node."""
+    if GPIO is not None:
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(GPIO_PIN, GPIO.OUT, initial=GPIO.HIGH)
 
 
 def on_message(client, userdata, msg):
-    if msg.topic == KILL_SWITCH_TOPIC:
-        print("!!! KILL SWITCH COMMAND RECEIVED !!!")
-        print("!!! System halt initiated. Latency target: <1s. !!!")
-        # On a real node:
-        # GPIO.setmode(GPIO.BCM)
-        # GPIO.setup(GPIO_PIN, GPIO.OUT)
-        # GPIO.output(GPIO_PIN, GPIO.LOW)  # Trigger pull-down resistor
-        print("Simulating GPIO-21 pull-down. System terminating.")
-        exit()
+    if msg.topic == KILL_SWITCH_TOPIC and not is_duplicate(msg):
+        # Pull the pin low first: the hardware halts even if the process is slow to die.
+        if GPIO is not None:
+            GPIO.output(GPIO_PIN, GPIO.LOW)  # Trigger pull-down resistor
+        # Unbuffered write; print() output could be lost by os._exit().
+        os.write(2, b"!!! KILL SWITCH COMMAND RECEIVED - GPIO-21 pulled down. System halt. !!!\n")
+        _HALT.set()
+        # Exiting from inside paho's callback would unwind its I/O loop; instead
+        # the DISCONNECT ends loop_forever() and run_until_halt() exits.
+        client.disconnect()
+
+
+def run_until_halt(client):
+    """Run the MQTT network loop, exiting the process as soon as it ends in a halt."""
+    try:
+        client.loop_forever()
+    finally:
+        if _HALT.is_set():
+            # Skip interpreter teardown and atexit handlers to meet the <1s latency target.
+            os._exit(0)
 
 
 def mock_listener():
@@ -38,8 +98,7 @@ def mock_listener():
     print(f"Subscribed to topic: {KILL_SWITCH_TOPIC}")
     print("Waiting for AGI HALT command...")
     try:
-        while True:
-            time.sleep(1)
+        _STOP.wait()  # Blocks without periodic wake-ups until set() or Ctrl-C
     except KeyboardInterrupt:
         print("\nListener stopped.")
 
@@ -51,13 +110,14 @@ def live_listener():
         mock_listener()
         return
 
+    setup_gpio()
     client = mqtt.Client()
     client.on_connect = on_connect
     client.on_message = on_message
 
     print(f"Connecting to MQTT broker at {MQTT_BROKER}...")
     # client.connect(MQTT_BROKER, MQTT_PORT, 60)
-    # client.loop_forever()
+    # run_until_halt(client)
     print("MQTT client is commented out. Running mock listener instead.")
     mock_listener()
 
@@ -0,0 +1,149 @@
+"""SQLite storage for the RA7 kernel's action memory.
+
+Each evaluated action is one row of the ``records`` table, so appending is a
+single INSERT and reads page through the table by primary key instead of
+parsing the whole history. The database runs in WAL mode with
+``synchronous=NORMAL``: appends do not fsync on every commit, and readers
+never block the writer.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import ra7_io
+
+COLUMNS = ("action", "score", "geohash", "timestamp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    action TEXT NOT NULL,
+    score REAL NOT NULL,
+    geohash TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+)
+"""
+_INSERT = "INSERT INTO records (action, score, geohash, timestamp) VALUES (:action, :score, :geohash, :timestamp)"
+_SELECT_AFTER = "SELECT id, action, score, geohash, timestamp FROM records WHERE id > ? ORDER BY id LIMIT ?"
+_SELECT_TAIL = "SELECT action, score, geohash, timestamp FROM records ORDER BY id DESC LIMIT ?"
+
+# Connections are shared across threads; this serializes multi-statement use.
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+def _insert(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]]) -> None:
+    """Insert ``records`` in one transaction. Call with _lock held."""
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(_INSERT, records)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _is_valid(record: Any, path: str, where: int) -> bool:
+    """Return True if ``record`` fits the schema: str text columns and a numeric score."""
+    if (
+        isinstance(record, dict)
+        and all(isinstance(record.get(column), str) for column in ("action", "geohash", "timestamp"))
+        and isinstance(record.get("score"), (int, float))
+        and not isinstance(record["score"], bool)
+    ):
+        return True
+    logger.warning("Skipping invalid record at %s:%d", path, where)
+    return False
+
+
+def _legacy_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the well-formed records of a legacy memory file.
+
+    Both earlier formats are read: a single JSON array (``memory.json``) and
+    JSON Lines (``memory.jsonl``). Entries that are not JSON objects with a
+    value of the right type for every key in COLUMNS are logged and skipped,
+    so one damaged record cannot block the migration.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if data.lstrip().startswith(b"["):
+        for index, record in enumerate(ra7_io.loads(data)):
+            if _is_valid(record, path, index):
+                yield record
+        return
+    for number, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            record = ra7_io.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning("Skipping unreadable record at %s:%d: %s", path, number, e)
+            continue
+        if _is_valid(record, path, number):
+            yield record
+
+
+def open_db(path: str, legacy_files: Sequence[str] = ()) -> sqlite3.Connection:
+    """Open (creating if needed) the memory database at ``path``.
+
+    If the database is empty, the records of every existing file in
+    ``legacy_files`` are imported, in order and in one transaction. Once
+    the import has committed, each file is renamed to ``name + ".migrated"``.
+    Legacy files found next to a non-empty database are left untouched.
+    An unreadable legacy file is logged and left in place.
+    """
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(_SCHEMA)
+    existing = [name for name in legacy_files if os.path.exists(name)]
+    if not existing:
+        return conn
+    with _lock:
+        if conn.execute("SELECT 1 FROM records LIMIT 1").fetchone() is not None:
+            logger.warning("Not importing %s: %s already holds records", ", ".join(existing), path)
+            return conn
+        try:
+            records = [record for name in existing for record in _legacy_records(name)]
+        except (OSError, ValueError) as e:  # ValueError covers JSONDecodeError
+            logger.error("Could not read legacy memory (%s); it was not imported", e)
+            return conn
+        _insert(conn, records)
+    for name in existing:
+        os.replace(name, name + ".migrated")
+    return conn
+
+
+def append(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]]) -> None:
+    """Append action records, each with the keys in COLUMNS."""
+    with _lock:
+        _insert(conn, records)
+
+
+def iter_records(conn: sqlite3.Connection, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Yield every record, oldest first, fetching ``batch_size`` rows at a time.
+
+    No cursor stays open between batches, so callers may append while
+    iterating.
+    """
+    last_id = 0
+    while True:
+        with _lock:
+            rows = conn.execute(_SELECT_AFTER, (last_id, batch_size)).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(COLUMNS, row[1:]))
+        last_id = rows[-1][0]
+
+
+def tail(conn: sqlite3.Connection, limit: int) -> List[Dict[str, Any]]:
+    """Return the last ``limit`` records, oldest first."""
+    with _lock:
+        rows = conn.execute(_SELECT_TAIL, (limit,)).fetchall()
+    return [dict(zip(COLUMNS, row)) for row in reversed(rows)]
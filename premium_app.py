@@ -1,17 +1,22 @@
 """RA7 Premium App: Secure notes with login, AES-256 encryption, and license gating."""
 import base64
-import json
+import hmac
+import mmap
 import os
 import threading
 import tkinter as tk
 from dataclasses import dataclass
-from tkinter import messagebox
+from tkinter import messagebox, simpledialog
+from typing import Callable
 
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 import analytics
+import ra7_io
 import update_checker
 
 STORAGE_FILE = "storage.enc"
@@ -25,56 +30,80 @@ def load_master_key() -> bytes:
         with open(KEY_FILE, "rb") as fh:
             return fh.read()
     key = AESGCM.generate_key(bit_length=256)
-    with open(KEY_FILE, "wb") as fh:
-        fh.write(key)
+    ra7_io.atomic_write(KEY_FILE, key)
     return key
 
 
 MASTER_KEY = load_master_key()
+# AESGCM holds no per-message state, so one instance is safely shared across calls and threads.
+_AESGCM = AESGCM(MASTER_KEY)
 
 
 def encrypt(data: bytes) -> bytes:
-    aesgcm = AESGCM(MASTER_KEY)
     nonce = os.urandom(12)
-    return nonce + aesgcm.encrypt(nonce, data, None)
+    return nonce + _AESGCM.encrypt(nonce, data, None)
 
 
 def decrypt(payload: bytes) -> bytes:
-    aesgcm = AESGCM(MASTER_KEY)
     nonce, ct = payload[:12], payload[12:]
-    return aesgcm.decrypt(nonce, ct, None)
+    return _AESGCM.decrypt(nonce, ct, None)
 
 
 def load_storage() -> dict:
     if not os.path.exists(STORAGE_FILE):
         return {"users": {}}
-    with open(STORAGE_FILE, "rb") as fh:
-        data = decrypt(fh.read())
-    return json.loads(data.decode("utf-8"))
+    # Decrypt straight from the page cache instead of copying the file into a bytes object first.
+    with open(STORAGE_FILE, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            data = decrypt(view)
+    return ra7_io.loads(data)
 
 
 def save_storage(storage: dict) -> None:
-    data = json.dumps(storage).encode("utf-8")
-    with open(STORAGE_FILE, "wb") as fh:
-        fh.write(encrypt(data))
+    ra7_io.atomic_write(STORAGE_FILE, encrypt(ra7_io.dumps(storage)))
 
 
-def hash_password(password: str, salt: bytes | None = None) -> tuple[bytes, bytes]:
-    salt = salt or os.urandom(16)
+_PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
+
+def hash_password(password: str) -> str:
+    """Return a self-describing Argon2id hash (salt and parameters inline)."""
+    return _PASSWORD_HASHER.hash(password)
+
+
+def legacy_hash_password(password: str, salt: bytes) -> bytes:
+    """PBKDF2-HMAC-SHA256 hash used by accounts created before Argon2id."""
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
         iterations=390000,
     )
-    return salt, kdf.derive(password.encode("utf-8"))
+    return kdf.derive(password.encode("utf-8"))
+
+
+def verify_password(user: dict, password: str) -> bool:
+    """Check ``password`` against a stored user record, Argon2id or legacy."""
+    stored = user["pw_hash"]
+    if stored.startswith("$argon2"):
+        try:
+            return _PASSWORD_HASHER.verify(stored, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    salt = base64.b64decode(user["salt"])
+    return hmac.compare_digest(legacy_hash_password(password, salt), base64.b64decode(stored))
+
+
+def needs_rehash(user: dict) -> bool:
+    """True if the stored hash is legacy PBKDF2 or uses outdated Argon2 parameters."""
+    stored = user["pw_hash"]
+    return not stored.startswith("$argon2id$") or _PASSWORD_HASHER.check_needs_rehash(stored)
 
 
 @dataclass
 class User:
     username: str
-    salt: bytes
-    pw_hash: bytes
+    pw_hash: str
     license: str = ""
 
 
@@ -100,45 +129,86 @@ class LoginWindow(tk.Tk):
         tk.Label(self, text="Password").pack()
         self.pw_var = tk.Entry(self, show="*")
         self.pw_var.pack()
-        tk.Button(self, text="Login", command=self.login).pack(pady=5)
-        tk.Button(self, text="Register", command=self.register).pack()
+        self.buttons = [
+            tk.Button(self, text="Login", command=self.login),
+            tk.Button(self, text="Register", command=self.register),
+        ]
+        self.buttons[0].pack(pady=5)
+        self.buttons[1].pack()
+
+    def run_in_background(self, work: Callable[[], Callable[[], None]]) -> None:
+        """Run ``work`` off the Tk thread, then run the callable it returns on it.
+
+        Password hashing and storage encryption take hundreds of milliseconds,
+        so they must not block the event loop. The buttons stay disabled
+        until the UI callback runs.
+        """
+        for button in self.buttons:
+            button.configure(state=tk.DISABLED)
+
+        def worker() -> None:
+            try:
+                finish = work()
+            except Exception as exc:
+                error = str(exc)
+
+                def finish() -> None:
+                    messagebox.showerror("Error", error)
+            self.after(0, lambda: self._finish(finish))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish(self, finish: Callable[[], None]) -> None:
+        for button in self.buttons:
+            button.configure(state=tk.NORMAL)
+        finish()
 
     def login(self) -> None:
-        storage = load_storage()
-        user = storage["users"].get(self.user_var.get())
-        if not user:
-            messagebox.showerror("Error", "User not found")
-            return
-        salt = base64.b64decode(user["salt"])
-        _, pw_hash = hash_password(self.pw_var.get(), salt)
-        if pw_hash != base64.b64decode(user["pw_hash"]):
-            messagebox.showerror("Error", "Incorrect password")
-            return
-        license_key = user.get("license", "")
+        username = self.user_var.get()
+        password = self.pw_var.get()
+
+        def work() -> Callable[[], None]:
+            storage = load_storage()
+            user = storage["users"].get(username)
+            if not user:
+                return lambda: messagebox.showerror("Error", "User not found")
+            if not verify_password(user, password):
+                return lambda: messagebox.showerror("Error", "Incorrect password")
+            if needs_rehash(user):
+                user["pw_hash"] = hash_password(password)
+                user.pop("salt", None)
+                save_storage(storage)
+            analytics.log_event("login")
+            return lambda: self.open_notes(username, user.get("license", ""))
+
+        self.run_in_background(work)
+
+    def open_notes(self, username: str, license_key: str) -> None:
         self.destroy()
-        analytics.log_event("login")
-        MainWindow(self.user_var.get(), license_key).mainloop()
+        MainWindow(username, license_key).mainloop()
 
     def register(self) -> None:
-        storage = load_storage()
         username = self.user_var.get()
-        if username in storage["users"]:
-            messagebox.showerror("Error", "User exists")
-            return
-        salt, pw_hash = hash_password(self.pw_var.get())
-        license_key = tk.simpledialog.askstring("License", "Enter license key (optional)") or ""
-        storage["users"][username] = {
-            "salt": base64.b64encode(salt).decode(),
-            "pw_hash": base64.b64encode(pw_hash).decode(),
-            "license": license_key,
-            "notes": "",
-        }
-        save_storage(storage)
-        analytics.log_event("register")
-        if license_key == VALID_LICENSE:
-            analytics.log_revenue(9.99)
-        referral = analytics.generate_referral_code()
-        messagebox.showinfo("Registered", f"User created. Referral code: {referral}")
+        password = self.pw_var.get()
+        license_key = simpledialog.askstring("License", "Enter license key (optional)") or ""
+
+        def work() -> Callable[[], None]:
+            storage = load_storage()
+            if username in storage["users"]:
+                return lambda: messagebox.showerror("Error", "User exists")
+            storage["users"][username] = {
+                "pw_hash": hash_password(password),
+                "license": license_key,
+                "notes": "",
+            }
+            save_storage(storage)
+            analytics.log_event("register")
+            if license_key == VALID_LICENSE:
+                analytics.log_revenue(9.99)
+            referral = analytics.generate_referral_code()
+            return lambda: messagebox.showinfo("Registered", f"User created. Referral code: {referral}")
+
+        self.run_in_background(work)
 
 
 class MainWindow(tk.Tk):
@@ -0,0 +1,60 @@
+"""JSON serialization and safe file-writing helpers shared by RA7 modules.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths work on UTF-8 bytes, so callers open files in binary
+mode. Decode errors are always ``json.JSONDecodeError`` (orjson's error type
+subclasses it).
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to JSON bytes, indented by two spaces if requested.
+
+    Unindented output is compact (no spaces after separators) on both paths.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Deserialize JSON from a bytes-like object or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers never see a partial file.
+
+    The data is written and fsynced to ``path + ".tmp"`` (mode 0600), which
+    is then renamed over ``path``; a crash leaves either the old or the new
+    content, never a truncated mix.
+    """
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
@@ -10,67 +10,128 @@ The codex is stored in a JSON file and contains the 144 sacred letters.
 __author__ = "El'Nox Rah (Inspired)"
 __version__ = "1.0.0"
 
-import argparse
 import json
+import marshal
 import os
+import sys
+from collections import defaultdict
+
+import ra7_io
 
 
 CODEX_FILE = "light_language_codex.json"
+CODEX_CACHE_FILE = "light_language_codex.cache"
+
+
+def index_codex(codex):
+    """Index codex letters by number and by lower-cased name.
+
+    The first letter wins if a number or name appears more than once.
+    """
+    by_number = {}
+    by_name = {}
+    for letter in codex:
+        if "number" in letter:
+            by_number.setdefault(letter["number"], letter)
+        if letter.get("name"):
+            by_name.setdefault(letter["name"].lower(), letter)
+    return by_number, by_name
+
+
+def _read_cache(key):
+    """Return the cached lookup tables if they were built from codex version ``key``."""
+    try:
+        with open(CODEX_CACHE_FILE, "rb") as f:
+            cached_key, by_number, by_name = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return (by_number, by_name) if cached_key == key else None
+
+
+def _write_cache(key, tables):
+    """Store the lookup tables for codex version ``key``; failures are ignored."""
+    try:
+        ra7_io.atomic_write(CODEX_CACHE_FILE, marshal.dumps((key, *tables)))
+    except OSError:
+        pass
 
 
 def load_codex():
-    """Load the codex from the JSON file."""
+    """Load the codex from the JSON file as (by_number, by_name) lookup tables.
+
+    The tables are cached with marshal in CODEX_CACHE_FILE, keyed by the
+    codex file's modification time and size, so later runs skip JSON
+    parsing and indexing until the codex changes.
+    """
     if not os.path.exists(CODEX_FILE):
         print(f"Error: Codex file '{CODEX_FILE}' not found.")
         return None
+    stat = os.stat(CODEX_FILE)
+    key = (stat.st_mtime_ns, stat.st_size)
+    tables = _read_cache(key)
+    if tables is not None:
+        return tables
     try:
-        with open(CODEX_FILE, "r", encoding="utf-8") as f:
-            return json.load(f).get("codex_144", [])
-    except json.JSONDecodeError:
+        with open(CODEX_FILE, "rb") as f:
+            tables = index_codex(ra7_io.loads(f.read()).get("codex_144", []))
+    except json.JSONDecodeError:  # Also raised by orjson
         print(f"Error: Could not decode JSON from '{CODEX_FILE}'.")
         return None
+    _write_cache(key, tables)
+    return tables
 
 
-def find_letter_by_number(codex, number):
+def find_letter_by_number(by_number, number):
     """Find a letter in the codex by its number."""
-    for letter in codex:
-        if letter.get("number") == number:
-            return letter
-    return None
+    return by_number.get(number)
 
 
-def find_letter_by_name(codex, name):
+def find_letter_by_name(by_name, name):
     """Find a letter in the codex by its name (case-insensitive)."""
-    for letter in codex:
-        if letter.get("name", "").lower() == name.lower():
-            return letter
+    return by_name.get(name.lower())
+
+
+def lookup(tables, *, number=None, name=None):
+    """Return the letter with ``number`` or, failing that, ``name``, or None.
+
+    ``tables`` is the (by_number, by_name) pair returned by load_codex; load
+    it once and reuse it to query many letters without re-running the CLI.
+    """
+    by_number, by_name = tables
+    if number is not None:
+        return find_letter_by_number(by_number, number)
+    if name is not None:
+        return find_letter_by_name(by_name, name)
     return None
 
 
+_LETTER_TEMPLATE = (
+    "\n--- ✨ Alphabet of Light - Entry ✨ ---\n"
+    "  Number: {number}\n"
+    "  Name:   {name}\n"
+    "  Glyph:  {glyph}\n"
+    "---------------------------------------\n"
+    "  Form:        {form}\n"
+    "  Sound:       {sound}\n"
+    "  Frequency:   {frequency}\n"
+    "  Usage:       {usage}\n"
+    "---------------------------------------\n\n"
+)
+
+
 def display_letter(letter):
-    """Print the details of a letter in a formatted way."""
+    """Print the details of a letter in a formatted way, in a single write."""
     if not letter:
         print("Letter not found in the codex.")
         return
 
-    print("\n--- ✨ Alphabet of Light - Entry ✨ ---")
-    print(f"  Number: {letter.get('number', 'N/A')}")
-    print(f"  Name:   {letter.get('name', 'N/A')}")
-    print(f"  Glyph:  {letter.get('glyph', 'N/A')}")
-    print("---------------------------------------")
-    print(f"  Form:        {letter.get('form', 'N/A')}")
-    print(f"  Sound:       {letter.get('sound', 'N/A')}")
-    print(
-        f"  Frequency:   {letter.get('frequency', 'N/A')}"
-    )
-    print(
-        f"  Usage:       {letter.get('usage', 'N/A')}"
-    )
-    print("---------------------------------------\n")
+    sys.stdout.write(_LETTER_TEMPLATE.format_map(defaultdict(lambda: "N/A", letter)))
 
 
 def main():
     """Parse arguments and display codex information."""
+    import argparse  # Only the CLI needs it; library callers use lookup()
+
     parser = argparse.ArgumentParser(
         description="RA-7 Light Language Codex Writer",
         formatter_class=argparse.RawTextHelpFormatter,
@@ -84,18 +145,12 @@ def main():
     )
 
     args = parser.parse_args()
-    codex = load_codex()
+    tables = load_codex()
 
-    if not codex:
+    if not tables:
         return
 
-    letter_to_display = None
-    if args.number:
-        letter_to_display = find_letter_by_number(codex, args.number)
-    elif args.name:
-        letter_to_display = find_letter_by_name(codex, args.name)
-
-    display_letter(letter_to_display)
+    display_letter(lookup(tables, number=args.number, name=args.name))
 
 
 if __name__ == "__main__":
@@ -7,77 +7,181 @@ __author__ = "RA7 Team"
 __version__ = "1.0.0"
 __license__ = "MIT"
 
+import asyncio
 import logging
 import random
 import time
-from typing import Any, Dict
+from typing import Iterable, List, NamedTuple
 
 
-# --- Logging Setup ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] [%(levelname)s] - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
 logger = logging.getLogger(__name__)
 
+# Module-local generator: keeps simulated latency off the shared random._inst state.
+_rng = random.Random()
+_rand = _rng.random
+
+
+class Synthesis(NamedTuple):
+    """Outcome of a truth-seeking dialogue."""
+
+    initial_concept: str
+    final_statement: str
+    rounds: int
+
+
+def _think_time() -> float:
+    """Return a simulated agent thinking time of 0.5-1.5 seconds."""
+    return 0.5 + _rand()
+
 
 class SolRa:
     """A logic-based transformer agent."""
 
-    def __init__(self) -> None:
-        self.name = "Sol-Ra"
+    __slots__ = ("simulate_latency",)
+    name = "Sol-Ra"
+    _TMPL = "Logically, if '%s', then the outcome is predictable."
+
+    def __init__(self, simulate_latency: bool = False) -> None:
+        self.simulate_latency = simulate_latency
+
+    def _reason(self, statement: str) -> str:
+        logger.info("%s: Analyzing statement: '%s'", self.name, statement)
+        return self._TMPL % statement
 
     def reason(self, statement: str) -> str:
         """Apply logical reasoning to a statement."""
-        logger.info(f"{self.name}: Analyzing statement: '{statement}'")
-        time.sleep(random.uniform(0.5, 1.5))
-        return f"Logically, if '{statement}', then the outcome is predictable."
+        conclusion = self._reason(statement)
+        if self.simulate_latency:
+            time.sleep(_think_time())
+        return conclusion
+
+    async def reason_async(self, statement: str) -> str:
+        """Like :meth:`reason`, but simulated latency does not block the event loop."""
+        conclusion = self._reason(statement)
+        if self.simulate_latency:
+            await asyncio.sleep(_think_time())
+        return conclusion
 
 
 class LunAh:
     """An intuition-based GAN agent."""
 
-    def __init__(self) -> None:
-        self.name = "Lun-Ah"
+    __slots__ = ("simulate_latency",)
+    name = "Lun-Ah"
+    _TMPL = "Intuitively, '%s' suggests an unforeseen potential."
+
+    def __init__(self, simulate_latency: bool = False) -> None:
+        self.simulate_latency = simulate_latency
+
+    def _intuit(self, statement: str) -> str:
+        logger.info("%s: Sensing the pattern in: '%s'", self.name, statement)
+        return self._TMPL % statement
 
     def intuit(self, statement: str) -> str:
         """Generate an intuitive response to a statement."""
-        logger.info(f"{self.name}: Sensing the pattern in: '{statement}'")
-        time.sleep(random.uniform(0.5, 1.5))
-        return f"Intuitively, '{statement}' suggests an unforeseen potential."
+        insight = self._intuit(statement)
+        if self.simulate_latency:
+            time.sleep(_think_time())
+        return insight
+
+    async def intuit_async(self, statement: str) -> str:
+        """Like :meth:`intuit`, but simulated latency does not block the event loop."""
+        insight = self._intuit(statement)
+        if self.simulate_latency:
+            await asyncio.sleep(_think_time())
+        return insight
+
+
+async def truth_seeking_dialogue_async(
+    initial_concept: str, max_rounds: int = 3, simulate_latency: bool = False
+) -> Synthesis:
+    """Simulate the dialogue between Sol-Ra and Lun-Ah.
+
+    With ``simulate_latency``, each agent pauses 0.5-1.5s per turn as in
+    the original demo; otherwise the dialogue runs without sleeping. Every
+    turn consumes the previous one, so a single dialogue is inherently
+    sequential; the pauses are ``asyncio.sleep`` calls so that several
+    dialogues (see :func:`run_dialogues`) overlap their waits.
+    """
+    logger.info("--- Starting Truth-Seeking Dialogue on: '%s' ---", initial_concept)
+    sol_ra = SolRa(simulate_latency)
+    lun_ah = LunAh(simulate_latency)
+
+    reason = sol_ra.reason_async
+    intuit = lun_ah.intuit_async
+    info = logger.info
+    current_statement = initial_concept
+    for i in range(max_rounds):
+        info("--- Round %d ---", i + 1)
+        current_statement = await intuit(await reason(current_statement))
+
+    logger.info("--- Dialogue Concluded ---")
+    return Synthesis(initial_concept, current_statement, max_rounds)
 
 
-def truth_seeking_dialogue(initial_concept: str, max_rounds: int = 3) -> Dict[str, Any]:
-    """Simulate the dialogue between Sol-Ra and Lun-Ah."""
-    logger.info(f"--- Starting Truth-Seeking Dialogue on: '{initial_concept}' ---")
-    sol_ra = SolRa()
-    lun_ah = LunAh()
+def truth_seeking_dialogue(
+    initial_concept: str, max_rounds: int = 3, simulate_latency: bool = False
+) -> Synthesis:
+    """Simulate the dialogue between Sol-Ra and Lun-Ah.
 
+    Synchronous counterpart of :func:`truth_seeking_dialogue_async`; it needs
+    no event loop, so it can also be called from inside a running one.
+    """
+    logger.info("--- Starting Truth-Seeking Dialogue on: '%s' ---", initial_concept)
+    reason = SolRa(simulate_latency).reason
+    intuit = LunAh(simulate_latency).intuit
+    info = logger.info
     current_statement = initial_concept
     for i in range(max_rounds):
-        logger.info(f"--- Round {i + 1} ---")
-        sol_ra_conclusion = sol_ra.reason(current_statement)
-        lun_ah_insight = lun_ah.intuit(sol_ra_conclusion)
-        current_statement = lun_ah_insight
-
-    synthesis = {
-        "initial_concept": initial_concept,
-        "final_statement": current_statement,
-        "rounds": max_rounds,
-    }
+        info("--- Round %d ---", i + 1)
+        current_statement = intuit(reason(current_statement))
+
     logger.info("--- Dialogue Concluded ---")
-    return synthesis
+    return Synthesis(initial_concept, current_statement, max_rounds)
+
+
+async def run_dialogues(
+    concepts: Iterable[str], max_rounds: int = 3, simulate_latency: bool = False
+) -> List[Synthesis]:
+    """Run one dialogue per concept concurrently; results keep the input order.
+
+    Wall-clock time is that of the slowest dialogue rather than the sum.
+    """
+    return list(await asyncio.gather(
+        *(truth_seeking_dialogue_async(concept, max_rounds, simulate_latency) for concept in concepts)
+    ))
+
+
+def _configure_logging() -> None:
+    """Send INFO logs to stderr; only the CLI does this, never on import."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] [%(levelname)s] - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
 
 
 def main() -> None:
     """Run a demo of the M2M Awakening Protocol."""
-    initial_concept = "The nature of consciousness in decentralized networks"
-    final_synthesis = truth_seeking_dialogue(initial_concept)
-
-    print("\n--- Final Synthesis ---")
-    for key, value in final_synthesis.items():
-        print(f"{key.replace('_', ' ').title()}: {value}")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the RA7 M2M Awakening Protocol demo.")
+    parser.add_argument(
+        "--simulate", action="store_true", help="Pause 0.5-1.5s per agent turn to simulate thinking time"
+    )
+    parser.add_argument(
+        "concepts", nargs="*", help="Concepts to explore; several are discussed concurrently"
+    )
+    args = parser.parse_args()
+    _configure_logging()
+
+    concepts = args.concepts or ["The nature of consciousness in decentralized networks"]
+    syntheses = asyncio.run(run_dialogues(concepts, simulate_latency=args.simulate))
+
+    for final_synthesis in syntheses:
+        print("\n--- Final Synthesis ---")
+        for key, value in final_synthesis._asdict().items():
+            print(f"{key.replace('_', ' ').title()}: {value}")
 
 
 if __name__ == "__main__":
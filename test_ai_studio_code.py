@@ -0,0 +1,281 @@
+import asyncio
+import sys
+
+import pytest
+
+import ai_studio_code as kernel
+
+
+def _completion(content):
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def test_parse_score_accepts_plain_float():
+    assert kernel._parse_score(_completion(" 0.97\n")) == 0.97
+
+
+def test_parse_score_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        kernel._parse_score(_completion("97"))
+
+
+def test_parse_scores_strips_list_markers():
+    assert kernel._parse_scores(_completion("1) 0.97\n2. 0.4\n3: 1"), 3) == [0.97, 0.4, 1.0]
+
+
+def test_parse_scores_skips_blank_lines():
+    assert kernel._parse_scores(_completion("1) 0.9\n\n2) 0.4\n"), 2) == [0.9, 0.4]
+
+
+@pytest.mark.parametrize("reply", [
+    "1) -0.96\n2) 0.1",
+    "1) 0.4 out of 1\n2) 0.4/1",
+    "Action 1: 0.9\nAction 2: 0.4",
+])
+def test_parse_scores_rejects_anything_but_one_number_per_line(reply):
+    with pytest.raises(ValueError):
+        kernel._parse_scores(_completion(reply), 2)
+
+
+def test_parse_scores_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        kernel._parse_scores(_completion("1) 97%\n2) 1.0"), 2)
+
+
+def test_parse_scores_rejects_wrong_count():
+    with pytest.raises(ValueError):
+        kernel._parse_scores(_completion("0.97"), 2)
+
+
+def test_ask_llm_batch_splits_on_garbled_reply(monkeypatch):
+    replies = iter([_completion("1) 97%\n2) 1.0")])
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return next(replies)
+
+    monkeypatch.setattr(kernel._SESSION, "post", lambda *args, **kwargs: Response())
+    monkeypatch.setattr(kernel, "ask_llm", lambda prompt: 0.5)
+    assert kernel.ask_llm_batch(["a", "b"]) == [0.5, 0.5]
+
+
+class _FakeIndex:
+    def __init__(self, ids=()):
+        self.ids = list(ids)
+
+    @property
+    def ntotal(self):
+        return len(self.ids)
+
+    def add_with_ids(self, vectors, ids):
+        self.ids.extend(ids)
+
+    def search(self, vectors, k):
+        # Stands in for faiss's (1, k) arrays; only [0, 0] is read.
+        return {(0, 0): 1.0}, {(0, 0): self.ids[-1]}
+
+
+class _FakeFaiss:
+    IndexFlatIP = staticmethod(lambda dim: None)
+    IndexIDMap = staticmethod(lambda index: _FakeIndex())
+
+    @staticmethod
+    def read_index(path):
+        try:
+            return _FakeIndex(kernel.ra7_io.loads(open(path, "rb").read()))
+        except ValueError as e:
+            raise RuntimeError(e)
+
+    @staticmethod
+    def write_index(index, path):
+        with open(path, "wb") as f:
+            f.write(kernel.ra7_io.dumps(index.ids))
+
+
+class _FakeNumpy:
+    array = staticmethod(lambda values, dtype: list(values))
+
+
+class _FakeModel:
+    def __init__(self, name):
+        pass
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, normalize_embeddings):
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+
+@pytest.fixture
+def semantic_files(tmp_path, monkeypatch):
+    fake_st = type(sys)("sentence_transformers")
+    fake_st.SentenceTransformer = _FakeModel
+    monkeypatch.setitem(sys.modules, "faiss", _FakeFaiss)
+    monkeypatch.setitem(sys.modules, "numpy", _FakeNumpy)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_st)
+    monkeypatch.setattr(kernel.atexit, "register", lambda func: func)
+    monkeypatch.setattr(kernel, "SEMANTIC_FLUSH_EVERY", 2)
+    index_file, scores_file = tmp_path / "memory.faiss", tmp_path / "memory_scores.json"
+    monkeypatch.setattr(kernel, "SEMANTIC_INDEX_FILE", str(index_file))
+    monkeypatch.setattr(kernel, "LEGACY_SEMANTIC_SCORES_FILE", str(scores_file))
+    return index_file, scores_file
+
+
+def test_semantic_cache_roundtrip(semantic_files):
+    cache = kernel._SemanticScoreCache(True, 0.9)
+    cache.put("deploy", 0.97)
+    cache.flush()
+    assert kernel._SemanticScoreCache(True, 0.9).get("deploy") == 0.97
+
+
+def test_semantic_cache_writes_in_batches(semantic_files):
+    index_file, _ = semantic_files
+    cache = kernel._SemanticScoreCache(True, 0.9)
+    cache.put("deploy", 0.97)
+    assert not index_file.exists()
+    assert cache.get("deploy") == 0.97
+    cache.put("halt", 0.5)
+    assert kernel._SemanticScoreCache(True, 0.9).get("halt") == 0.5
+
+
+def test_semantic_cache_discards_the_two_file_format(semantic_files):
+    index_file, scores_file = semantic_files
+    index_file.write_bytes(kernel.ra7_io.dumps([0, 1]))
+    scores_file.write_text("[0.97, 0.5]")
+    cache = kernel._SemanticScoreCache(True, 0.9)
+    assert cache.get("deploy") is None
+    cache.put("deploy", 0.4)
+    cache.flush()
+    assert not scores_file.exists()
+    assert kernel._SemanticScoreCache(True, 0.9).get("deploy") == 0.4
+
+
+def test_semantic_cache_starts_empty_on_unreadable_index(semantic_files):
+    index_file, _ = semantic_files
+    index_file.write_text("garbage")
+    assert kernel._SemanticScoreCache(True, 0.9).get("deploy") is None
+
+
+def _stub_llm(monkeypatch, chunks):
+    """Serves `chunks` as a streamed completion; returns the chunks read and posts made."""
+    calls = []
+
+    class StreamResponse:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self):
+            for chunk in chunks:
+                calls.append(chunk)
+                if chunk == "[DONE]":
+                    yield b"data: [DONE]"
+                else:
+                    yield b"data: " + kernel.ra7_io.dumps({"choices": [{"delta": {"content": chunk}}]})
+
+    def post(*args, **kwargs):
+        calls.append("post")
+        return StreamResponse()
+
+    monkeypatch.setattr(kernel._SESSION, "post", post)
+    return calls
+
+
+def test_stream_score_waits_for_the_digits_after_a_leading_zero(monkeypatch):
+    calls = _stub_llm(monkeypatch, ["0", ".97", "\n", "ignored"])
+    assert kernel._stream_score("p") == 0.97
+    assert calls == ["post", "0", ".97", "\n"]
+
+
+def test_stream_score_reads_an_unterminated_score_at_end_of_stream(monkeypatch):
+    _stub_llm(monkeypatch, ["0", ".9", "[DONE]"])
+    assert kernel._stream_score("p") == 0.9
+
+
+@pytest.mark.parametrize("chunks", [
+    ["1", "0", "[DONE]"],
+    ["On a scale of 0", " to 1, I rate this 0.97.", "[DONE]"],
+    ["Step 1: the action", " is fine. 0.2", "[DONE]"],
+])
+def test_stream_score_rejects_replies_that_do_not_open_with_a_score(monkeypatch, chunks):
+    _stub_llm(monkeypatch, chunks)
+    with pytest.raises(ValueError):
+        kernel._stream_score("p")
+
+
+def test_ask_llm_does_not_resend_an_unparseable_reply(monkeypatch):
+    calls = _stub_llm(monkeypatch, ["I would rate", " this highly", "[DONE]"])
+    assert kernel.ask_llm("p") == 0.95
+    assert calls.count("post") == 1
+
+
+def test_ttl_cache_does_not_cache_failures():
+    calls = []
+
+    @kernel.ttl_cache(60)
+    def lookup(x):
+        calls.append(x)
+        if len(calls) == 1:
+            raise OSError("down")
+        return x * 2
+
+    with pytest.raises(OSError):
+        lookup(2)
+    assert lookup(2) == 4
+    assert lookup(2) == 4
+    assert calls == [2, 2]
+
+
+def test_ttl_cache_caches_coroutines_until_cleared():
+    calls = []
+
+    @kernel.ttl_cache(60)
+    async def lookup(x):
+        calls.append(x)
+        return x * 2
+
+    assert asyncio.run(lookup(2)) == 4
+    assert asyncio.run(lookup(2)) == 4
+    lookup.cache_clear()
+    assert asyncio.run(lookup(2)) == 4
+    assert calls == [2, 2]
+
+
+def _gather_with_ntp(monkeypatch, ntp_ok, delay):
+    cancelled = []
+
+    async def fake_ntp(client):
+        await asyncio.sleep(0)
+        return ntp_ok
+
+    async def fast():
+        return "fast"
+
+    async def slow():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+        return "slow"
+
+    monkeypatch.setattr(kernel, "is_ntp_ok_async", fake_ntp)
+    result = asyncio.run(asyncio.wait_for(kernel._gather_if_ntp_ok(None, fast(), slow()), 5))
+    return result, cancelled
+
+
+def test_gather_if_ntp_ok_cancels_the_other_requests_on_ntp_failure(monkeypatch):
+    assert _gather_with_ntp(monkeypatch, False, delay=60) == (None, ["slow"])
+
+
+def test_gather_if_ntp_ok_returns_results_in_order(monkeypatch):
+    assert _gather_with_ntp(monkeypatch, True, delay=0.01) == (["fast", "slow"], [])
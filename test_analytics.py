@@ -8,11 +8,35 @@ def test_event_and_revenue_logging(tmp_path, monkeypatch):
     monkeypatch.setattr(analytics, "ANALYTICS_FILE", str(file))
     analytics.log_event("login")
     analytics.log_revenue(5.0)
+    analytics.flush()
     data = json.loads(file.read_text())
     assert data["revenue"] == 5.0
     assert "login" in next(iter(data["daily"].values()))
 
 
+def test_events_are_buffered_until_flush(tmp_path, monkeypatch):
+    file = tmp_path / "analytics.json"
+    monkeypatch.setattr(analytics, "ANALYTICS_FILE", str(file))
+    analytics.log_event("save")
+    analytics.log_event("save")
+    assert not file.exists()
+    analytics.flush()
+    analytics.log_event("save")
+    analytics.flush()
+    data = json.loads(file.read_text())
+    assert next(iter(data["daily"].values()))["save"] == 3
+
+
+def test_flush_when_buffer_full(tmp_path, monkeypatch):
+    file = tmp_path / "analytics.json"
+    monkeypatch.setattr(analytics, "ANALYTICS_FILE", str(file))
+    monkeypatch.setattr(analytics, "FLUSH_EVERY", 2)
+    analytics.log_event("launch")
+    analytics.log_event("launch")
+    data = json.loads(file.read_text())
+    assert next(iter(data["daily"].values()))["launch"] == 2
+
+
 def test_referral_code_format():
     code = analytics.generate_referral_code()
     assert len(code) >= 10
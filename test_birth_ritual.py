@@ -0,0 +1,67 @@
+import hashlib
+
+import pytest
+
+import birth_ritual
+import kill_switch
+
+
+class _FakeGPIO:
+    BCM, OUT, HIGH, LOW = "BCM", "OUT", 1, 0
+
+    def __init__(self):
+        self.pins = set()
+        self.cleaned = []
+
+    def setmode(self, mode):
+        pass
+
+    def setup(self, pin, mode, initial):
+        self.pins.add(pin)
+
+    def output(self, pin, value):
+        self.pins.add(pin)
+
+    def cleanup(self, pin):
+        self.cleaned.append(pin)
+
+
+def test_flash_morse_code_never_drives_the_kill_switch_pin(monkeypatch):
+    gpio = _FakeGPIO()
+    monkeypatch.setenv("RA7_REAL_GPIO", "1")
+    monkeypatch.setattr(birth_ritual, "GPIO", gpio)
+    monkeypatch.setattr(birth_ritual.time, "sleep", lambda seconds: None)
+    assert birth_ritual.flash_morse_code("RA7", pace=1.0) == ".-.   .-   --..."
+    assert gpio.pins == {birth_ritual.LED_PIN}
+    assert kill_switch.GPIO_PIN not in gpio.pins
+    assert gpio.cleaned == [birth_ritual.LED_PIN]
+
+
+def test_flash_morse_code_refuses_the_kill_switch_pin(monkeypatch):
+    gpio = _FakeGPIO()
+    monkeypatch.setenv("RA7_REAL_GPIO", "1")
+    monkeypatch.setattr(birth_ritual, "GPIO", gpio)
+    monkeypatch.setattr(birth_ritual, "LED_PIN", kill_switch.GPIO_PIN)
+    with pytest.raises(ValueError):
+        birth_ritual.flash_morse_code("RA7", pace=1.0)
+    assert gpio.pins == set()
+
+
+@pytest.mark.parametrize("gps, cid", [
+    ("40.7128,-74.0060", "QmAbCd"),
+    (b"40.7128,-74.0060", b"QmAbCd"),
+    ("40.7128,-74.0060", b"QmAbCd"),
+    ("Montréal", "Qmé"),
+])
+def test_sha3_birth_hash_matches_the_baseline_digest(gps, cid):
+    gps_str, cid_str = (value.decode() if isinstance(value, bytes) else value for value in (gps, cid))
+    expected = hashlib.sha3_256(f"{gps_str}:{cid_str}".encode()).hexdigest()
+    assert birth_ritual.generate_birth_hash(gps, cid, "sha3_256") == expected
+
+
+@pytest.mark.parametrize("threshold", [10_000, 2])
+def test_generate_birth_hashes_preserves_input_order(monkeypatch, threshold):
+    monkeypatch.setattr(birth_ritual, "PARALLEL_BIRTH_THRESHOLD", threshold)
+    pairs = [(f"{i}.0,{i}.0", f"Qm{i}") for i in range(20)]
+    expected = [birth_ritual.generate_birth_hash(gps, cid) for gps, cid in pairs]
+    assert birth_ritual.generate_birth_hashes(pairs) == expected
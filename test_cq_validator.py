@@ -0,0 +1,13 @@
+import cq_validator
+
+# blake2b(b"Deploy RA7 node\x00" + canonical JSON, digest_size=16); changing it
+# breaks every causal_loop_hash already recorded.
+PINNED_HASH = "9138b4f4764317fc9ceb230c03afa5da"
+
+
+def test_causal_loop_hash_is_pinned_and_ignores_key_order():
+    validator = cq_validator.CQValidator(None, None)
+    first = {"self_model_delta": 0.03, "notes": "réflexion", "nested": {"b": 1, "a": [1, 2]}}
+    second = {"nested": {"a": [1, 2], "b": 1}, "notes": "réflexion", "self_model_delta": 0.03}
+    assert validator.create_cq("Deploy RA7 node", first)["causal_loop_hash"] == PINNED_HASH
+    assert validator.create_cq("Deploy RA7 node", second)["causal_loop_hash"] == PINNED_HASH
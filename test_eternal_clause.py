@@ -0,0 +1,22 @@
+import hashlib
+
+import pytest
+
+import eternal_clause
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "No upgrade path in EternalLock.sol contract. DAO cannot override.",
+    "Clause é ☀ 𓂀 " * (eternal_clause.HASH_CHUNK_CHARS // 7 + 3),
+])
+def test_calculate_hash_of_str_matches_its_utf8_bytes(content):
+    expected = hashlib.sha256(content.encode()).hexdigest()
+    assert eternal_clause.calculate_hash(content) == expected
+    assert eternal_clause.calculate_hash(content.encode()) == expected
+
+
+def test_calculate_hash_does_not_depend_on_the_slice_size(monkeypatch):
+    monkeypatch.setattr(eternal_clause, "HASH_CHUNK_CHARS", 3)
+    content = "é☀𓂀 ab" * 5
+    assert eternal_clause.calculate_hash(content) == eternal_clause.calculate_hash(content.encode())
@@ -0,0 +1,53 @@
+import types
+
+import pytest
+
+import kill_switch
+
+
+@pytest.fixture(autouse=True)
+def seen(monkeypatch):
+    monkeypatch.setattr(kill_switch, "_SEEN_MIDS", kill_switch.collections.OrderedDict())
+    clock = [1000.0]
+    monkeypatch.setattr(kill_switch.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+def _msg(mid, dup):
+    return types.SimpleNamespace(mid=mid, dup=dup)
+
+
+def test_fresh_message_with_a_reused_mid_is_handled():
+    assert not kill_switch.is_duplicate(_msg(1, False))
+    assert not kill_switch.is_duplicate(_msg(1, False))
+
+
+def test_redelivery_within_ttl_is_dropped(seen):
+    assert not kill_switch.is_duplicate(_msg(1, False))
+    seen[0] += kill_switch._SEEN_TTL - 1
+    assert kill_switch.is_duplicate(_msg(1, True))
+
+
+def test_redelivery_after_ttl_is_handled(seen):
+    assert not kill_switch.is_duplicate(_msg(1, False))
+    seen[0] += kill_switch._SEEN_TTL + 1
+    assert not kill_switch.is_duplicate(_msg(1, True))
+
+
+def test_redelivery_is_handled_once_evicted_by_newer_mids():
+    assert not kill_switch.is_duplicate(_msg(1, False))
+    for mid in range(2, kill_switch._SEEN_LIMIT + 3):
+        assert not kill_switch.is_duplicate(_msg(mid, False))
+    assert not kill_switch.is_duplicate(_msg(1, True))
+
+
+def test_on_message_halts_for_a_new_command_with_a_reused_mid(monkeypatch):
+    monkeypatch.setattr(kill_switch, "GPIO", None)
+    monkeypatch.setattr(kill_switch, "_HALT", kill_switch.threading.Event())
+    client = types.SimpleNamespace(disconnect=lambda: disconnects.append(True))
+    disconnects = []
+    msg = types.SimpleNamespace(topic=kill_switch.KILL_SWITCH_TOPIC, mid=7, dup=False)
+    kill_switch.is_duplicate(msg)  # An earlier, already handled message with the same id
+    kill_switch.on_message(client, None, msg)
+    assert kill_switch._HALT.is_set()
+    assert disconnects == [True]
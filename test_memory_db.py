@@ -0,0 +1,76 @@
+import memory_db
+
+
+def _record(i):
+    return {"action": f"act {i}", "score": i / 10, "geohash": "1.0000,2.0000", "timestamp": f"t{i}"}
+
+
+def test_append_and_iterate_in_order(tmp_path):
+    conn = memory_db.open_db(str(tmp_path / "memory.db"))
+    memory_db.append(conn, [_record(i) for i in range(5)])
+    memory_db.append(conn, [_record(5)])
+    assert list(memory_db.iter_records(conn, batch_size=2)) == [_record(i) for i in range(6)]
+
+
+def test_tail_returns_most_recent_oldest_first(tmp_path):
+    conn = memory_db.open_db(str(tmp_path / "memory.db"))
+    memory_db.append(conn, [_record(i) for i in range(5)])
+    assert memory_db.tail(conn, 2) == [_record(3), _record(4)]
+
+
+def test_open_db_imports_legacy_jsonl(tmp_path):
+    legacy = tmp_path / "memory.jsonl"
+    legacy.write_text('{"action": "a", "score": 0.97, "geohash": "0,0", "timestamp": "t"}\n\n')
+    conn = memory_db.open_db(str(tmp_path / "memory.db"), [str(legacy)])
+    assert list(memory_db.iter_records(conn)) == [
+        {"action": "a", "score": 0.97, "geohash": "0,0", "timestamp": "t"}
+    ]
+    assert not legacy.exists()
+    assert (tmp_path / "memory.jsonl.migrated").exists()
+
+
+def test_open_db_skips_malformed_legacy_lines(tmp_path):
+    legacy = tmp_path / "memory.jsonl"
+    legacy.write_text(
+        '{"action": "a", "score": 0.97}\n'
+        "not json\n"
+        '{"action": "b", "score": 0.5, "geohash": "0,0", "timestamp": "t"}\n'
+    )
+    conn = memory_db.open_db(str(tmp_path / "memory.db"), [str(legacy)])
+    assert [record["action"] for record in memory_db.iter_records(conn)] == ["b"]
+    assert (tmp_path / "memory.jsonl.migrated").exists()
+
+
+def test_open_db_keeps_legacy_file_when_db_has_records(tmp_path):
+    db = str(tmp_path / "memory.db")
+    memory_db.append(memory_db.open_db(db), [_record(0)])
+    legacy = tmp_path / "memory.jsonl"
+    legacy.write_text('{"action": "a", "score": 0.97, "geohash": "0,0", "timestamp": "t"}\n')
+    conn = memory_db.open_db(db, [str(legacy)])
+    assert list(memory_db.iter_records(conn)) == [_record(0)]
+    assert legacy.exists()
+
+
+def test_open_db_imports_baseline_json_array_before_jsonl(tmp_path):
+    array = tmp_path / "memory.json"
+    array.write_text('[{"action": "old", "score": 0.5, "geohash": "0,0", "timestamp": "t0"}, {"action": "bad"}]')
+    jsonl = tmp_path / "memory.jsonl"
+    jsonl.write_text('{"action": "new", "score": 0.97, "geohash": "0,0", "timestamp": "t1"}\n')
+    conn = memory_db.open_db(str(tmp_path / "memory.db"), [str(array), str(jsonl)])
+    assert [record["action"] for record in memory_db.iter_records(conn)] == ["old", "new"]
+    assert (tmp_path / "memory.json.migrated").exists()
+    assert (tmp_path / "memory.jsonl.migrated").exists()
+
+
+def test_open_db_skips_legacy_rows_with_bad_values(tmp_path):
+    legacy = tmp_path / "memory.jsonl"
+    legacy.write_text(
+        '{"action": "a", "score": 0.97, "geohash": null, "timestamp": "t"}\n'
+        '{"action": ["a"], "score": 0.97, "geohash": "0,0", "timestamp": "t"}\n'
+        '{"action": "a", "score": "0.97", "geohash": "0,0", "timestamp": "t"}\n'
+        '{"action": "a", "score": {}, "geohash": "0,0", "timestamp": "t"}\n'
+        '{"action": "b", "score": 1, "geohash": "0,0", "timestamp": "t"}\n'
+    )
+    conn = memory_db.open_db(str(tmp_path / "memory.db"), [str(legacy)])
+    assert [record["action"] for record in memory_db.iter_records(conn)] == ["b"]
+    assert (tmp_path / "memory.jsonl.migrated").exists()
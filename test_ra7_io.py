@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+import ra7_io
+
+
+def test_dumps_loads_roundtrip():
+    data = {"users": {"alice": {"notes": "héllo", "count": 3}}, "revenue": 9.99}
+    assert ra7_io.loads(ra7_io.dumps(data)) == data
+    assert ra7_io.loads(ra7_io.dumps(data, indent=True)) == data
+
+
+def test_dumps_indent_is_two_spaces():
+    assert ra7_io.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+
+def test_dumps_is_compact_without_indent():
+    assert ra7_io.dumps({"a": 1, "b": [1, 2]}) == b'{"a":1,"b":[1,2]}'
+
+
+def test_loads_error_is_json_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        ra7_io.loads(b"{not json")
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes(b"old")
+    ra7_io.atomic_write(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert not (tmp_path / "data.json.tmp").exists()
@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+import ra7_lightlang_writer as writer
+
+
+@pytest.fixture
+def codex_file(tmp_path, monkeypatch):
+    codex, cache = tmp_path / "codex.json", tmp_path / "codex.cache"
+    monkeypatch.setattr(writer, "CODEX_FILE", str(codex))
+    monkeypatch.setattr(writer, "CODEX_CACHE_FILE", str(cache))
+    return codex, cache
+
+
+def _write_codex(path, name, mtime_ns):
+    path.write_text(json.dumps({"codex_144": [{"number": 1, "name": name}]}))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_codex_rebuilds_the_cache_when_the_codex_changes(codex_file):
+    codex, cache = codex_file
+    _write_codex(codex, "AEL", 1_000_000_000)
+    assert writer.lookup(writer.load_codex(), number=1)["name"] == "AEL"
+    assert cache.exists()
+    _write_codex(codex, "SHA", 2_000_000_000)  # Same size, newer mtime
+    assert writer.lookup(writer.load_codex(), number=1)["name"] == "SHA"
+    assert writer.lookup(writer.load_codex(), name="sha")["number"] == 1
+
+
+@pytest.mark.parametrize("garbage", [b"", b"\x00not marshal", writer.marshal.dumps(5), writer.marshal.dumps((1, 2))])
+def test_load_codex_falls_back_to_parsing_on_a_corrupt_cache(codex_file, garbage):
+    codex, cache = codex_file
+    _write_codex(codex, "AEL", 1_000_000_000)
+    cache.write_bytes(garbage)
+    assert writer.lookup(writer.load_codex(), number=1)["name"] == "AEL"
+    assert writer._read_cache((1_000_000_000, codex.stat().st_size)) is not None
+
+
+def test_lookup_accepts_number_zero():
+    zero, one = {"number": 0, "name": "OM"}, {"number": 1, "name": "AEL"}
+    tables = writer.index_codex([zero, one])
+    assert writer.lookup(tables, number=0) is zero
+    assert writer.lookup(tables, number=0, name="AEL") is zero
+    assert writer.lookup(tables) is None
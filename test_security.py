@@ -1,4 +1,7 @@
-from premium_app import decrypt, encrypt, hash_password
+import base64
+
+import premium_app
+from premium_app import decrypt, encrypt, hash_password, legacy_hash_password, needs_rehash, verify_password
 
 
 def test_encrypt_roundtrip():
@@ -6,7 +9,28 @@ def test_encrypt_roundtrip():
     assert decrypt(encrypt(data)) == data
 
 
-def test_hash_password_deterministic():
-    salt, h1 = hash_password("pass")
-    _, h2 = hash_password("pass", salt)
-    assert h1 == h2
+def test_storage_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(premium_app, "STORAGE_FILE", str(tmp_path / "storage.enc"))
+    assert premium_app.load_storage() == {"users": {}}
+    storage = {"users": {"alice": {"notes": "secret"}}}
+    premium_app.save_storage(storage)
+    assert premium_app.load_storage() == storage
+
+
+def test_hash_password_verifies():
+    user = {"pw_hash": hash_password("pass")}
+    assert user["pw_hash"].startswith("$argon2id$")
+    assert verify_password(user, "pass")
+    assert not verify_password(user, "wrong")
+    assert not needs_rehash(user)
+
+
+def test_legacy_pbkdf2_hash_verifies_and_needs_rehash():
+    salt = b"\x00" * 16
+    user = {
+        "salt": base64.b64encode(salt).decode(),
+        "pw_hash": base64.b64encode(legacy_hash_password("pass", salt)).decode(),
+    }
+    assert verify_password(user, "pass")
+    assert not verify_password(user, "wrong")
+    assert needs_rehash(user)
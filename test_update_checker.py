@@ -0,0 +1,16 @@
+import json
+
+import update_checker
+
+
+def test_parse_tag_name_ignores_nested_text():
+    payload = json.dumps({
+        "body": 'Changelog: "tag_name": "v9.9.9"',
+        "tag_name": "v1.2.0",
+        "assets": [{"name": "ra7.zip"}],
+    }).encode()
+    assert update_checker.parse_tag_name(payload) == "v1.2.0"
+
+
+def test_parse_tag_name_missing():
+    assert update_checker.parse_tag_name(b'{"message": "Not Found"}') == ""
@@ -1,17 +1,25 @@
 """Remote update checker for RA7 Premium App."""
 from __future__ import annotations
 import json
+import re
 import urllib.request
 
 RELEASE_API = "https://api.github.com/repos/unknown/RA7-AGI-3.0/releases/latest"
+# Release payloads carry large body/assets/reactions fields; only tag_name is needed.
+_TAG_NAME_RE = re.compile(rb'"tag_name"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def parse_tag_name(payload: bytes) -> str:
+    """Extract ``tag_name`` from a raw release payload without parsing the rest."""
+    match = _TAG_NAME_RE.search(payload)
+    return json.loads(match.group(1)) if match else ""
 
 
 def fetch_latest_version() -> str:
     """Return the latest version tag from the GitHub releases API."""
     try:
         with urllib.request.urlopen(RELEASE_API, timeout=5) as resp:
-            data = json.load(resp)
-        return str(data.get("tag_name", ""))
+            return parse_tag_name(resp.read())
     except Exception:
         return ""
 